@@ -5,7 +5,60 @@ Standardized constants for TM API values.
 Reference: Captured from TM API responses Nov 2025.
 """
 
-from enum import IntEnum, Enum
+import re
+from enum import IntEnum, StrEnum
+from typing import Final, Optional, Tuple
+
+
+# Label lookup tables indexed by status/role/rating/type code (index 0 unused)
+_RO_STATUS_LABELS: Final[Tuple[Optional[str], ...]] = (
+    None,
+    "Estimate",
+    "Work In Progress",
+    "Waiting for Parts",
+    "Waiting for Approval",
+    "Posted",
+    "Completed",
+    "Void",
+)
+
+_EMPLOYEE_ROLE_LABELS: Final[Tuple[Optional[str], ...]] = (
+    None,
+    "Shop Admin",
+    "Service Advisor",
+    "Technician",
+    "Owner",
+    "Parts Manager",
+)
+
+_INSPECTION_RATING_LABELS: Final[Tuple[Optional[str], ...]] = (
+    None,
+    "Good",
+    "May Require Attention",
+    "Requires Attention",
+)
+
+_PAYMENT_TYPE_LABELS: Final[Tuple[Optional[str], ...]] = (
+    None,
+    "Cash",
+    "Check",
+    "Credit Card",
+    "Debit Card",
+    "Other",
+    "Financing",
+)
+
+
+# Fee name classifier. Alternatives are tried in priority order at the start
+# of the name, so "shop supplies" wins over "hazardous" when both appear.
+# Group names match the lowercase fee category strings.
+FEE_NAME_PATTERN: Final[re.Pattern] = re.compile(
+    r"(?P<shop_supplies>(?=.*shop)(?=.*suppl))"
+    r"|(?P<environmental>(?=.*environ))"
+    r"|(?P<hazardous_waste>(?=.*haz))"
+    r"|(?P<disposal>(?=.*dispos))",
+    re.IGNORECASE | re.DOTALL,
+)
 
 
 class ROStatus(IntEnum):
@@ -20,16 +73,9 @@ class ROStatus(IntEnum):
 
     @classmethod
     def to_label(cls, status: int) -> str:
-        labels = {
-            1: "Estimate",
-            2: "Work In Progress",
-            3: "Waiting for Parts",
-            4: "Waiting for Approval",
-            5: "Posted",
-            6: "Completed",
-            7: "Void"
-        }
-        return labels.get(status, f"Unknown ({status})")
+        if isinstance(status, int) and 0 < status < len(_RO_STATUS_LABELS):
+            return _RO_STATUS_LABELS[status]
+        return f"Unknown ({status})"
 
 
 class EmployeeRole(IntEnum):
@@ -42,14 +88,9 @@ class EmployeeRole(IntEnum):
 
     @classmethod
     def to_label(cls, role: int) -> str:
-        labels = {
-            1: "Shop Admin",
-            2: "Service Advisor",
-            3: "Technician",
-            4: "Owner",
-            5: "Parts Manager"
-        }
-        return labels.get(role, f"Unknown ({role})")
+        if isinstance(role, int) and 0 < role < len(_EMPLOYEE_ROLE_LABELS):
+            return _EMPLOYEE_ROLE_LABELS[role]
+        return f"Unknown ({role})"
 
 
 class InspectionRating(IntEnum):
@@ -60,12 +101,9 @@ class InspectionRating(IntEnum):
 
     @classmethod
     def to_label(cls, rating: int) -> str:
-        labels = {
-            1: "Good",
-            2: "May Require Attention",
-            3: "Requires Attention"
-        }
-        return labels.get(rating, f"Unknown ({rating})")
+        if isinstance(rating, int) and 0 < rating < len(_INSPECTION_RATING_LABELS):
+            return _INSPECTION_RATING_LABELS[rating]
+        return f"Unknown ({rating})"
 
 
 class CustomerType(IntEnum):
@@ -74,14 +112,19 @@ class CustomerType(IntEnum):
     BUSINESS = 2
 
 
-class JobBoard(str, Enum):
+class JobBoard(StrEnum):
     """Job board types"""
     ACTIVE = "ACTIVE"
     POSTED = "POSTED"
     COMPLETE = "COMPLETE"
 
 
-class FeeType(str, Enum):
+# Plain-string membership set for validating raw board values without
+# constructing enum members
+JOB_BOARD_VALUES: Final[frozenset] = frozenset(board.value for board in JobBoard)
+
+
+class FeeType(StrEnum):
     """Fee categories for GP attribution"""
     SHOP_SUPPLIES = "SHOP_SUPPLIES"
     ENVIRONMENTAL = "ENVIRONMENTAL"
@@ -92,26 +135,20 @@ class FeeType(str, Enum):
     @classmethod
     def from_name(cls, name: str) -> "FeeType":
         """Detect fee type from name string"""
-        name_lower = name.lower()
-        if "shop" in name_lower and "suppl" in name_lower:
-            return cls.SHOP_SUPPLIES
-        elif "environ" in name_lower:
-            return cls.ENVIRONMENTAL
-        elif "hazard" in name_lower or "haz" in name_lower:
-            return cls.HAZARDOUS_WASTE
-        elif "dispos" in name_lower:
-            return cls.DISPOSAL
-        return cls.OTHER
-
-
-class TechRateSource(str, Enum):
+        match = FEE_NAME_PATTERN.match(name)
+        if match is None:
+            return cls.OTHER
+        return cls[match.lastgroup.upper()]
+
+
+class TechRateSource(StrEnum):
     """Source of technician rate used in GP calculation"""
     ASSIGNED = "assigned"           # Tech explicitly assigned to labor
     SHOP_AVERAGE = "shop_average"   # Fallback to shop average
     DEFAULT = "default"             # Fallback to default ($25/hr)
 
 
-class AuthorizationMethod(str, Enum):
+class AuthorizationMethod(StrEnum):
     """Job authorization methods"""
     VERBAL_IN_PERSON = "VERBAL_IN_PERSON"
     VERBAL_BY_PHONE = "VERBAL_BY_PHONE"
@@ -130,12 +167,6 @@ class PaymentType(IntEnum):
 
     @classmethod
     def to_label(cls, ptype: int) -> str:
-        labels = {
-            1: "Cash",
-            2: "Check",
-            3: "Credit Card",
-            4: "Debit Card",
-            5: "Other",
-            6: "Financing"
-        }
-        return labels.get(ptype, f"Unknown ({ptype})")
+        if isinstance(ptype, int) and 0 < ptype < len(_PAYMENT_TYPE_LABELS):
+            return _PAYMENT_TYPE_LABELS[ptype]
+        return f"Unknown ({ptype})"
@@ -2,9 +2,8 @@
 Pydantic Models for Request/Response Validation
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
-from datetime import datetime
 
 
 # Authorization Models
@@ -20,6 +19,8 @@ class AuthorizationRequest(BaseModel):
 
 class JobAuthStatus(BaseModel):
     """Job authorization status"""
+    model_config = ConfigDict(frozen=True)
+
     id: int
     authorized: bool
     selected: bool = True
@@ -48,6 +49,8 @@ class PaymentResponse(BaseModel):
 # Customer Models
 class PhoneNumber(BaseModel):
     """Customer phone number"""
+    model_config = ConfigDict(frozen=True)
+
     number: str
     type: str = "Mobile"
     primary: bool = True
@@ -55,6 +58,8 @@ class PhoneNumber(BaseModel):
 
 class Address(BaseModel):
     """Customer/shop address"""
+    model_config = ConfigDict(frozen=True)
+
     address1: str
     address2: Optional[str] = ""
     city: str
@@ -130,6 +135,8 @@ class ROListQuery(BaseModel):
 
 class RepairOrderBasic(BaseModel):
     """Basic RO information"""
+    model_config = ConfigDict(frozen=True)
+
     id: int
     repair_order_number: int
     customer_full_name: str
@@ -4,14 +4,35 @@ Advanced Operations Endpoints
 Sublets, fees, discounts, notes, and customer concerns.
 """
 
-from fastapi import APIRouter, HTTPException
+import functools
+
+import httpx
+from fastapi import APIRouter, HTTPException, Request
 from app.services.tm_client import get_tm_client
+from app.services.http_cache import etag_response
 
 router = APIRouter()
 
 
+def tm_proxy(func):
+    """Translate TM client errors into HTTP errors for proxy endpoints."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        except httpx.HTTPStatusError as e:
+            # Pass TM's status through (404, 401, 429, ...) instead of a blanket 500
+            raise HTTPException(status_code=e.response.status_code, detail=e.response.text or str(e))
+        except httpx.RequestError as e:
+            raise HTTPException(status_code=502, detail=f"TM request failed: {e}")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    return wrapper
+
+
 # Customer Concerns
 @router.get("/ro/{ro_id}/customer-concerns")
+@tm_proxy
 async def get_customer_concerns(ro_id: int):
     """
     Get customer concerns for repair order
@@ -19,16 +40,11 @@ async def get_customer_concerns(ro_id: int):
     - **ro_id**: Repair order ID
     """
     tm = get_tm_client()
-    await tm._ensure_token()
-
-    try:
-        result = await tm.get(f"/api/repair-orders/{ro_id}/customer-concerns")
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await tm.get(f"/api/repair-orders/{ro_id}/customer-concerns")
 
 
 @router.post("/ro/{ro_id}/customer-concerns")
+@tm_proxy
 async def add_customer_concern(ro_id: int, concern_data: dict):
     """
     Add customer concern to repair order
@@ -37,17 +53,12 @@ async def add_customer_concern(ro_id: int, concern_data: dict):
     - **concern_data**: Concern details
     """
     tm = get_tm_client()
-    await tm._ensure_token()
-
-    try:
-        result = await tm.post(f"/api/repair-orders/{ro_id}/customer-concerns", concern_data)
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await tm.post(f"/api/repair-orders/{ro_id}/customer-concerns", concern_data)
 
 
 # Technician Concerns
 @router.get("/ro/{ro_id}/technician-concerns")
+@tm_proxy
 async def get_technician_concerns(ro_id: int):
     """
     Get technician concerns/findings for repair order
@@ -55,17 +66,12 @@ async def get_technician_concerns(ro_id: int):
     - **ro_id**: Repair order ID
     """
     tm = get_tm_client()
-    await tm._ensure_token()
-
-    try:
-        result = await tm.get(f"/api/repair-orders/{ro_id}/technician-concerns")
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await tm.get(f"/api/repair-orders/{ro_id}/technician-concerns")
 
 
 # Comments/Notes
 @router.get("/ro/{ro_id}/comments")
+@tm_proxy
 async def get_ro_comments(ro_id: int):
     """
     Get comments/notes for repair order
@@ -73,17 +79,12 @@ async def get_ro_comments(ro_id: int):
     - **ro_id**: Repair order ID
     """
     tm = get_tm_client()
-    await tm._ensure_token()
-
-    try:
-        result = await tm.get(f"/api/repair-order/{ro_id}/comments")
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await tm.get(f"/api/repair-order/{ro_id}/comments")
 
 
 # Job Clocks (Time Tracking per Job)
 @router.get("/ro/{ro_id}/job-clocks")
+@tm_proxy
 async def get_job_clocks(ro_id: int):
     """
     Get job clock entries (time tracking for jobs)
@@ -91,79 +92,67 @@ async def get_job_clocks(ro_id: int):
     - **ro_id**: Repair order ID
     """
     tm = get_tm_client()
-    await tm._ensure_token()
+    if not tm.token_valid():
+        await tm._ensure_token()
     shop_id = tm.get_shop_id()
-
-    try:
-        result = await tm.get(f"/api/shop/{shop_id}/repair-order/{ro_id}/job-clocks")
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await tm.get(f"/api/shop/{shop_id}/repair-order/{ro_id}/job-clocks")
 
 
 # Fluid Units
 @router.get("/shop/fluid-units")
-async def get_fluid_units():
+@tm_proxy
+async def get_fluid_units(request: Request):
     """
     Get fluid unit configuration (quarts, gallons, etc.)
     """
     tm = get_tm_client()
-    await tm._ensure_token()
+    if not tm.token_valid():
+        await tm._ensure_token()
     shop_id = tm.get_shop_id()
-
-    try:
-        result = await tm.get(f"/api/shop/{shop_id}/fluid-units")
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await tm.get(f"/api/shop/{shop_id}/fluid-units")
+    return etag_response(request, result)
 
 
 # Customer Settings
 @router.get("/shop/customer-settings")
-async def get_customer_settings():
+@tm_proxy
+async def get_customer_settings(request: Request):
     """
     Get customer-related settings and configuration
     """
     tm = get_tm_client()
-    await tm._ensure_token()
+    if not tm.token_valid():
+        await tm._ensure_token()
     shop_id = tm.get_shop_id()
-
-    try:
-        result = await tm.get(f"/api/shop/{shop_id}/customer-settings")
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await tm.get(f"/api/shop/{shop_id}/customer-settings")
+    return etag_response(request, result)
 
 
 # TekMessage Config
 @router.get("/shop/tekmessage-config")
-async def get_tekmessage_config():
+@tm_proxy
+async def get_tekmessage_config(request: Request):
     """
     Get TekMessage (SMS/Email) configuration
     """
     tm = get_tm_client()
-    await tm._ensure_token()
+    if not tm.token_valid():
+        await tm._ensure_token()
     shop_id = tm.get_shop_id()
-
-    try:
-        result = await tm.get(f"/api/shop/{shop_id}/tekmessage/config")
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await tm.get(f"/api/shop/{shop_id}/tekmessage/config")
+    return etag_response(request, result)
 
 
 # TekMessage Templates
 @router.get("/shop/tekmessage-templates")
-async def get_tekmessage_templates():
+@tm_proxy
+async def get_tekmessage_templates(request: Request):
     """
     Get TekMessage templates for SMS/Email
     """
     tm = get_tm_client()
-    await tm._ensure_token()
+    if not tm.token_valid():
+        await tm._ensure_token()
     shop_id = tm.get_shop_id()
-
-    try:
-        result = await tm.get(f"/api/shop/{shop_id}/tekmessage/template")
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await tm.get(f"/api/shop/{shop_id}/tekmessage/template")
+    return etag_response(request, result)
@@ -5,24 +5,71 @@ Endpoints for service advisor performance tracking.
 Provides sales, GP, and volume metrics per advisor.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+import asyncio
+from operator import attrgetter
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from datetime import date, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, FrozenSet
 
 from app.services.tm_client import get_tm_client
+from app.services.ttl_cache import TTLCache, range_ttl
+from app.services.streaming import ndjson_response
+from app.services.http_cache import etag_response
 from app.services.gp_calculator import (
     calculate_ro_true_gp,
     aggregate_advisor_performance,
     get_shop_config,
     AdvisorPerformance,
-    cents_to_dollars
+    ROTrueGP
 )
 
 router = APIRouter()
 
+# Advisor metrics are integer cents, so "cents / 100" is already the exact
+# 2-decimal dollar value (same result as cents_to_dollars, without the call)
 
-async def _get_ro_results(start_date: str, end_date: str, status_filter: List[int] = None):
-    """Helper to fetch and calculate RO GP results."""
+# Max in-flight estimate requests per aggregation
+MAX_CONCURRENT_ESTIMATES = 10
+
+# Endpoint responses keyed by (endpoint, shop_id, start, end, params)
+_response_cache = TTLCache()
+
+# /leaderboard sort_by -> AdvisorPerformance sort key
+_LEADERBOARD_SORT_KEYS = {
+    "sales": attrgetter("total_sales"),
+    "gp": attrgetter("gross_profit"),
+    "gp_pct": attrgetter("gp_percentage"),
+    "aro": attrgetter("aro"),
+    "ro_count": attrgetter("ro_count")
+}
+
+# (ro_results, advisor_perf) keyed by (shop_id, start, end, advisor_ids), shared by all endpoints
+_aggregate_cache = TTLCache(maxsize=32)
+
+
+async def _get_shop_id() -> str:
+    """Resolve the shop ID (used to key cached responses)."""
+    client = get_tm_client()
+    if not client.token_valid():
+        await client._ensure_token()
+    return client.get_shop_id()
+
+
+async def _get_ro_results(
+    start_date: str,
+    end_date: str,
+    status_filter: List[int] = None,
+    advisor_ids: Optional[FrozenSet[int]] = None
+):
+    """
+    Helper to fetch and calculate RO GP results.
+
+    advisor_ids limits ROs to those service writers (0 = unassigned) and
+    skips GP work for everyone else.
+
+    Returns (results, shop_id, partial); partial is True when any board or
+    estimate fetch failed, so the results must not be cached.
+    """
     from datetime import datetime
 
     client = get_tm_client()
@@ -32,6 +79,7 @@ async def _get_ro_results(start_date: str, end_date: str, status_filter: List[in
 
     # Fetch ROs from all boards
     all_ros = []
+    fetch_errors = []
     for board in ["ACTIVE", "POSTED", "COMPLETE"]:
         try:
             ros_page = await client.get(
@@ -42,16 +90,29 @@ async def _get_ro_results(start_date: str, end_date: str, status_filter: List[in
                 all_ros.extend(ros_page)
         except Exception as e:
             print(f"[Advisors] Error fetching {board} ROs: {e}")
+            fetch_errors.append(board)
+
+    # Drop ROs for other advisors when the board row already says who wrote them
+    if advisor_ids is not None:
+        keep_ids = advisor_ids | {None}
+        all_ros = [ro for ro in all_ros if _board_row_advisor_id(ro) in keep_ids]
 
     # Parse date range
     start_dt = date.fromisoformat(start_date)
     end_dt = date.fromisoformat(end_date)
 
-    results = []
-    for ro in all_ros:
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_ESTIMATES)
+
+    async def _calculate(ro: dict):
         try:
             # Get full estimate for GP calculation
-            estimate = await client.get(f"/api/repair-order/{ro['id']}/estimate")
+            async with semaphore:
+                estimate = await client.get(f"/api/repair-order/{ro['id']}/estimate")
+
+            if advisor_ids is not None:
+                service_writer = estimate.get("serviceWriter") or {}
+                if (service_writer.get("id") or 0) not in advisor_ids:
+                    return None
 
             # Check if RO has authorized jobs in date range
             has_auth_in_range = False
@@ -68,14 +129,114 @@ async def _get_ro_results(start_date: str, end_date: str, status_filter: List[in
                         pass
 
             if not has_auth_in_range:
-                continue
+                return None
 
-            gp = calculate_ro_true_gp(estimate, shop_config=shop_config, authorized_only=True)
-            results.append(gp)
+            # Advisor metrics only read RO-level totals; don't keep line items
+            return calculate_ro_true_gp(
+                estimate, shop_config=shop_config, authorized_only=True, include_line_items=False
+            )
         except Exception as e:
             print(f"[Advisors] Error calculating GP for RO {ro.get('id')}: {e}")
+            fetch_errors.append(ro.get("id"))
+            return None
+
+    # Estimate fetches dominate; run them concurrently (bounded) in board order
+    calculated = await asyncio.gather(*(_calculate(ro) for ro in all_ros))
+    results = [gp for gp in calculated if gp is not None]
+
+    return results, shop_id, bool(fetch_errors)
+
+
+DateRange = Tuple[date, date]
+
+
+def _date_range_dependency(default_days: int, max_days: int):
+    """
+    Build a dependency resolving start/end/days query params to (start_date, end_date).
+
+    end defaults to today and start to `days` before end. Bad dates are a 400.
+    """
+    async def parse_date_range(
+        start: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+        end: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+        days: int = Query(default_days, description="Default days if no dates", ge=1, le=max_days)
+    ) -> DateRange:
+        try:
+            end_date = date.fromisoformat(end) if end else date.today()
+            start_date = date.fromisoformat(start) if start else end_date - timedelta(days=days)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid date format: {e}")
+        return start_date, end_date
+
+    return parse_date_range
+
 
-    return results, shop_id
+parse_date_range = _date_range_dependency(default_days=30, max_days=365)
+parse_week_range = _date_range_dependency(default_days=7, max_days=90)
+
+
+def _board_row_advisor_id(ro: dict) -> Optional[int]:
+    """Service writer ID from a job-board row, or None if the row doesn't carry it."""
+    if ro.get("serviceWriterId") is not None:
+        return ro["serviceWriterId"]
+    if ro.get("serviceWriter"):
+        return ro["serviceWriter"].get("id")
+    return None
+
+
+async def _get_advisor_aggregates(
+    start_date: date,
+    end_date: date,
+    advisor_ids: Optional[FrozenSet[int]] = None
+) -> Tuple[List[ROTrueGP], Dict[int, AdvisorPerformance], bool]:
+    """
+    Get RO results and the per-advisor aggregation for a date range.
+
+    Cached per (shop_id, start, end) so every advisor endpoint over the same
+    range shares one RO fetch and one aggregation pass. With advisor_ids,
+    only those advisors' ROs are fetched and aggregated, unless the full
+    range is already cached, in which case it is sliced instead.
+
+    The last element is True when some ROs could not be fetched; partial
+    results are returned but not cached.
+    """
+    shop_id = await _get_shop_id()
+    full = _aggregate_cache.get((shop_id, start_date, end_date, None))
+    if full is not None and advisor_ids is not None:
+        ro_results, advisor_perf, _ = full
+        return (
+            [r for r in ro_results if (r.advisor_id or 0) in advisor_ids],
+            {aid: perf for aid, perf in advisor_perf.items() if aid in advisor_ids},
+            False
+        )
+
+    cache_key = (shop_id, start_date, end_date, advisor_ids)
+    cached = full if advisor_ids is None else _aggregate_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    ro_results, _, partial = await _get_ro_results(
+        start_date.isoformat(), end_date.isoformat(), advisor_ids=advisor_ids
+    )
+    advisor_perf = aggregate_advisor_performance(ro_results)
+
+    if not partial:
+        _aggregate_cache.set(cache_key, (ro_results, advisor_perf, False), range_ttl(end_date))
+    return ro_results, advisor_perf, partial
+
+
+def _cache_response(cache_key: tuple, response: dict, end_date: date, partial: bool) -> int:
+    """
+    Cache an endpoint response and return the max-age to send with it.
+
+    Responses built from a partial RO fetch are neither cached here nor by
+    the client (max-age=0), so the next request retries the failed fetches.
+    """
+    if partial:
+        return 0
+    ttl = range_ttl(end_date)
+    _response_cache.set(cache_key, response, ttl)
+    return ttl
 
 
 # =============================================================================
@@ -84,9 +245,8 @@ async def _get_ro_results(start_date: str, end_date: str, status_filter: List[in
 
 @router.get("/performance")
 async def get_advisor_performance(
-    start: str = Query(None, description="Start date (YYYY-MM-DD)"),
-    end: str = Query(None, description="End date (YYYY-MM-DD)"),
-    days: int = Query(30, description="Default days if no dates", ge=1, le=365)
+    request: Request,
+    dates: DateRange = Depends(parse_date_range)
 ):
     """
     Get service advisor performance metrics.
@@ -94,29 +254,21 @@ async def get_advisor_performance(
     Returns sales, GP, and volume metrics per advisor for the period.
     """
     try:
-        # Parse dates
-        if end:
-            end_date = date.fromisoformat(end)
-        else:
-            end_date = date.today()
+        start_date, end_date = dates
+        date_range = {"start": start_date.isoformat(), "end": end_date.isoformat()}
 
-        if start:
-            start_date = date.fromisoformat(start)
-        else:
-            start_date = end_date - timedelta(days=days)
+        shop_id = await _get_shop_id()
+        cache_key = ("performance", shop_id, start_date, end_date)
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return etag_response(request, cached, range_ttl(end_date))
 
         # Get RO results
-        ro_results, shop_id = await _get_ro_results(
-            start_date.isoformat(),
-            end_date.isoformat()
-        )
+        ro_results, advisor_perf, partial = await _get_advisor_aggregates(start_date, end_date)
 
         if not ro_results:
-            return {
-                "date_range": {
-                    "start": start_date.isoformat(),
-                    "end": end_date.isoformat()
-                },
+            response = {
+                "date_range": date_range,
                 "advisors": [],
                 "summary": {
                     "advisor_count": 0,
@@ -125,70 +277,70 @@ async def get_advisor_performance(
                     "ros_analyzed": 0
                 }
             }
-
-        # Aggregate by advisor
-        advisor_perf = aggregate_advisor_performance(ro_results)
+            max_age = _cache_response(cache_key, response, end_date, partial)
+            return etag_response(request, response, max_age)
 
         # Sort by sales descending
         advisors_list = sorted(
             advisor_perf.values(),
-            key=lambda a: a.total_sales,
+            key=attrgetter("total_sales"),
             reverse=True
         )
 
         # Convert to response format
-        advisors_response = []
-        for adv in advisors_list:
-            advisors_response.append({
+        advisors_response = [
+            {
                 "advisor_id": adv.advisor_id,
                 "advisor_name": adv.advisor_name,
-                "total_sales": cents_to_dollars(adv.total_sales),
-                "total_cost": cents_to_dollars(adv.total_cost),
-                "gross_profit": cents_to_dollars(adv.gross_profit),
+                "total_sales": adv.total_sales / 100,
+                "total_cost": adv.total_cost / 100,
+                "gross_profit": adv.gross_profit / 100,
                 "gp_percentage": adv.gp_percentage,
                 "ro_count": adv.ro_count,
                 "job_count": adv.job_count,
-                "aro": cents_to_dollars(adv.aro),
-                "avg_job_value": cents_to_dollars(adv.avg_job_value),
+                "aro": adv.aro / 100,
+                "avg_job_value": adv.avg_job_value / 100,
                 "category_breakdown": {
-                    "parts": cents_to_dollars(adv.parts_sales),
-                    "labor": cents_to_dollars(adv.labor_sales),
-                    "sublet": cents_to_dollars(adv.sublet_sales),
-                    "fees": cents_to_dollars(adv.fee_sales)
+                    "parts": adv.parts_sales / 100,
+                    "labor": adv.labor_sales / 100,
+                    "sublet": adv.sublet_sales / 100,
+                    "fees": adv.fee_sales / 100
                 }
-            })
+            }
+            for adv in advisors_list
+        ]
 
-        # Summary stats
-        total_sales = sum(a.total_sales for a in advisors_list)
-        total_gp = sum(a.gross_profit for a in advisors_list)
-        total_ros = sum(a.ro_count for a in advisors_list)
+        # Summary stats (single pass)
+        total_sales = 0
+        total_gp = 0
+        total_ros = 0
+        for adv in advisors_list:
+            total_sales += adv.total_sales
+            total_gp += adv.gross_profit
+            total_ros += adv.ro_count
 
-        return {
-            "date_range": {
-                "start": start_date.isoformat(),
-                "end": end_date.isoformat()
-            },
+        response = {
+            "date_range": date_range,
             "advisors": advisors_response,
             "summary": {
                 "advisor_count": len(advisors_list),
-                "total_sales": cents_to_dollars(total_sales),
-                "total_gp": cents_to_dollars(total_gp),
+                "total_sales": total_sales / 100,
+                "total_gp": total_gp / 100,
                 "avg_gp_pct": round(total_gp / total_sales * 100, 2) if total_sales > 0 else 0,
                 "ros_analyzed": total_ros
             }
         }
+        max_age = _cache_response(cache_key, response, end_date, partial)
+        return etag_response(request, response, max_age)
 
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=f"Invalid date format: {e}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/leaderboard")
 async def get_advisor_leaderboard(
-    start: str = Query(None, description="Start date (YYYY-MM-DD)"),
-    end: str = Query(None, description="End date (YYYY-MM-DD)"),
-    days: int = Query(7, description="Default days if no dates", ge=1, le=90),
+    request: Request,
+    dates: DateRange = Depends(parse_week_range),
     sort_by: str = Query("sales", description="Sort by: sales, gp, gp_pct, aro, ro_count")
 ):
     """
@@ -197,45 +349,29 @@ async def get_advisor_leaderboard(
     Great for weekly/monthly advisor rankings.
     """
     try:
-        # Parse dates
-        if end:
-            end_date = date.fromisoformat(end)
-        else:
-            end_date = date.today()
+        start_date, end_date = dates
+        date_range = {"start": start_date.isoformat(), "end": end_date.isoformat()}
 
-        if start:
-            start_date = date.fromisoformat(start)
-        else:
-            start_date = end_date - timedelta(days=days)
+        shop_id = await _get_shop_id()
+        cache_key = ("leaderboard", shop_id, start_date, end_date, sort_by)
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return etag_response(request, cached, range_ttl(end_date))
 
         # Get RO results
-        ro_results, _ = await _get_ro_results(
-            start_date.isoformat(),
-            end_date.isoformat()
-        )
+        ro_results, advisor_perf, partial = await _get_advisor_aggregates(start_date, end_date)
 
         if not ro_results:
-            return {
-                "date_range": {
-                    "start": start_date.isoformat(),
-                    "end": end_date.isoformat()
-                },
+            response = {
+                "date_range": date_range,
                 "leaderboard": [],
                 "sort_by": sort_by
             }
-
-        # Aggregate
-        advisor_perf = aggregate_advisor_performance(ro_results)
+            max_age = _cache_response(cache_key, response, end_date, partial)
+            return etag_response(request, response, max_age)
 
         # Sort by chosen metric
-        sort_key_map = {
-            "sales": lambda a: a.total_sales,
-            "gp": lambda a: a.gross_profit,
-            "gp_pct": lambda a: a.gp_percentage,
-            "aro": lambda a: a.aro,
-            "ro_count": lambda a: a.ro_count
-        }
-        sort_key = sort_key_map.get(sort_by, sort_key_map["sales"])
+        sort_key = _LEADERBOARD_SORT_KEYS.get(sort_by, _LEADERBOARD_SORT_KEYS["sales"])
 
         leaderboard = sorted(
             advisor_perf.values(),
@@ -244,133 +380,147 @@ async def get_advisor_leaderboard(
         )
 
         # Build leaderboard response
-        result = []
-        for rank, adv in enumerate(leaderboard, 1):
-            result.append({
+        result = [
+            {
                 "rank": rank,
                 "advisor_id": adv.advisor_id,
                 "advisor_name": adv.advisor_name,
-                "total_sales": cents_to_dollars(adv.total_sales),
-                "gross_profit": cents_to_dollars(adv.gross_profit),
+                "total_sales": adv.total_sales / 100,
+                "gross_profit": adv.gross_profit / 100,
                 "gp_percentage": adv.gp_percentage,
-                "aro": cents_to_dollars(adv.aro),
+                "aro": adv.aro / 100,
                 "ro_count": adv.ro_count,
                 "job_count": adv.job_count
-            })
+            }
+            for rank, adv in enumerate(leaderboard, 1)
+        ]
 
-        return {
-            "date_range": {
-                "start": start_date.isoformat(),
-                "end": end_date.isoformat()
-            },
+        response = {
+            "date_range": date_range,
             "leaderboard": result,
             "sort_by": sort_by
         }
+        max_age = _cache_response(cache_key, response, end_date, partial)
+        return etag_response(request, response, max_age)
 
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=f"Invalid date format: {e}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/advisor/{advisor_id}")
 async def get_single_advisor_performance(
+    request: Request,
     advisor_id: int,
-    start: str = Query(None, description="Start date (YYYY-MM-DD)"),
-    end: str = Query(None, description="End date (YYYY-MM-DD)"),
-    days: int = Query(30, description="Default days if no dates", ge=1, le=365)
+    dates: DateRange = Depends(parse_date_range),
+    stream: bool = Query(False, description="Stream as NDJSON: summary line, then one line per RO")
 ):
     """
     Get detailed performance for a single advisor.
 
-    Includes RO-level breakdown.
+    Includes RO-level breakdown. With stream=true the response is NDJSON:
+    the first line is the summary (without "ros"), then one line per RO.
     """
     try:
-        # Parse dates
-        if end:
-            end_date = date.fromisoformat(end)
-        else:
-            end_date = date.today()
-
-        if start:
-            start_date = date.fromisoformat(start)
-        else:
-            start_date = end_date - timedelta(days=days)
-
-        # Get RO results
-        ro_results, _ = await _get_ro_results(
-            start_date.isoformat(),
-            end_date.isoformat()
+        start_date, end_date = dates
+        date_range = {"start": start_date.isoformat(), "end": end_date.isoformat()}
+
+        shop_id = await _get_shop_id()
+        cache_key = ("advisor", shop_id, start_date, end_date, advisor_id)
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return _stream_advisor(cached) if stream else etag_response(request, cached, range_ttl(end_date))
+
+        # Only this advisor's ROs are fetched and aggregated
+        advisor_ros, advisor_perf, partial = await _get_advisor_aggregates(
+            start_date, end_date, advisor_ids=frozenset((advisor_id,))
         )
 
-        # Filter to this advisor's ROs
-        advisor_ros = [r for r in ro_results if r.advisor_id == advisor_id]
-
         if not advisor_ros:
-            return {
+            response = {
                 "advisor_id": advisor_id,
-                "date_range": {
-                    "start": start_date.isoformat(),
-                    "end": end_date.isoformat()
-                },
+                "date_range": date_range,
                 "message": "No ROs found for this advisor in the period",
                 "ro_count": 0
             }
+            max_age = _cache_response(cache_key, response, end_date, partial)
+            return _stream_advisor(response) if stream else etag_response(request, response, max_age)
 
-        # Get aggregated performance
-        advisor_perf = aggregate_advisor_performance(advisor_ros)
+        # Aggregated performance (same as aggregating just this advisor's ROs)
         adv = advisor_perf.get(advisor_id)
 
         # Build RO list
-        ro_list = []
-        for ro in advisor_ros:
-            ro_list.append({
+        ro_list = [
+            {
                 "ro_id": ro.ro_id,
                 "ro_number": ro.ro_number,
                 "customer": ro.customer_name,
                 "vehicle": ro.vehicle_description,
-                "total": cents_to_dollars(ro.total_retail),
-                "gp": cents_to_dollars(ro.gross_profit),
+                "total": ro.total_retail / 100,
+                "gp": ro.gross_profit / 100,
                 "gp_pct": ro.margin_pct,
                 "jobs": ro.authorized_job_count
-            })
+            }
+            for ro in advisor_ros
+        ]
 
-        return {
+        response = {
             "advisor_id": advisor_id,
             "advisor_name": adv.advisor_name if adv else "Unknown",
-            "date_range": {
-                "start": start_date.isoformat(),
-                "end": end_date.isoformat()
-            },
+            "date_range": date_range,
             "summary": {
-                "total_sales": cents_to_dollars(adv.total_sales) if adv else 0,
-                "gross_profit": cents_to_dollars(adv.gross_profit) if adv else 0,
+                "total_sales": adv.total_sales / 100 if adv else 0,
+                "gross_profit": adv.gross_profit / 100 if adv else 0,
                 "gp_percentage": adv.gp_percentage if adv else 0,
                 "ro_count": adv.ro_count if adv else 0,
                 "job_count": adv.job_count if adv else 0,
-                "aro": cents_to_dollars(adv.aro) if adv else 0
+                "aro": adv.aro / 100 if adv else 0
             },
             "category_breakdown": {
-                "parts": cents_to_dollars(adv.parts_sales) if adv else 0,
-                "labor": cents_to_dollars(adv.labor_sales) if adv else 0,
-                "sublet": cents_to_dollars(adv.sublet_sales) if adv else 0,
-                "fees": cents_to_dollars(adv.fee_sales) if adv else 0
+                "parts": adv.parts_sales / 100 if adv else 0,
+                "labor": adv.labor_sales / 100 if adv else 0,
+                "sublet": adv.sublet_sales / 100 if adv else 0,
+                "fees": adv.fee_sales / 100 if adv else 0
             },
             "ros": ro_list
         }
+        max_age = _cache_response(cache_key, response, end_date, partial)
+        return _stream_advisor(response) if stream else etag_response(request, response, max_age)
 
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=f"Invalid date format: {e}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _stream_advisor(response: dict):
+    """NDJSON form of a /advisor/{id} response: header line, then one line per RO."""
+    header = {k: v for k, v in response.items() if k != "ros"}
+    return ndjson_response(header, response.get("ros", []))
+
+
+def _comparison_entry(advisor_id: int, adv: Optional[AdvisorPerformance]) -> dict:
+    """Response row for one advisor in /compare."""
+    if not adv:
+        return {
+            "advisor_id": advisor_id,
+            "advisor_name": "Not Found",
+            "message": "No data for this advisor in period"
+        }
+    return {
+        "advisor_id": advisor_id,
+        "advisor_name": adv.advisor_name,
+        "total_sales": adv.total_sales / 100,
+        "gross_profit": adv.gross_profit / 100,
+        "gp_percentage": adv.gp_percentage,
+        "ro_count": adv.ro_count,
+        "aro": adv.aro / 100,
+        "avg_job_value": adv.avg_job_value / 100
+    }
+
+
 @router.get("/compare")
 async def compare_advisors(
+    request: Request,
     advisor_ids: str = Query(..., description="Comma-separated advisor IDs to compare"),
-    start: str = Query(None, description="Start date (YYYY-MM-DD)"),
-    end: str = Query(None, description="End date (YYYY-MM-DD)"),
-    days: int = Query(30, description="Default days if no dates", ge=1, le=365)
+    dates: DateRange = Depends(parse_date_range)
 ):
     """
     Compare performance between multiple advisors.
@@ -381,55 +531,29 @@ async def compare_advisors(
         # Parse advisor IDs
         ids = [int(id.strip()) for id in advisor_ids.split(",")]
 
-        # Parse dates
-        if end:
-            end_date = date.fromisoformat(end)
-        else:
-            end_date = date.today()
+        start_date, end_date = dates
+        date_range = {"start": start_date.isoformat(), "end": end_date.isoformat()}
 
-        if start:
-            start_date = date.fromisoformat(start)
-        else:
-            start_date = end_date - timedelta(days=days)
+        shop_id = await _get_shop_id()
+        cache_key = ("compare", shop_id, start_date, end_date, tuple(ids))
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return etag_response(request, cached, range_ttl(end_date))
 
-        # Get RO results
-        ro_results, _ = await _get_ro_results(
-            start_date.isoformat(),
-            end_date.isoformat()
+        # Only the requested advisors' ROs are fetched and aggregated
+        ro_results, advisor_perf, partial = await _get_advisor_aggregates(
+            start_date, end_date, advisor_ids=frozenset(ids)
         )
 
-        # Aggregate
-        advisor_perf = aggregate_advisor_performance(ro_results)
-
         # Build comparison
-        comparison = []
-        for aid in ids:
-            adv = advisor_perf.get(aid)
-            if adv:
-                comparison.append({
-                    "advisor_id": aid,
-                    "advisor_name": adv.advisor_name,
-                    "total_sales": cents_to_dollars(adv.total_sales),
-                    "gross_profit": cents_to_dollars(adv.gross_profit),
-                    "gp_percentage": adv.gp_percentage,
-                    "ro_count": adv.ro_count,
-                    "aro": cents_to_dollars(adv.aro),
-                    "avg_job_value": cents_to_dollars(adv.avg_job_value)
-                })
-            else:
-                comparison.append({
-                    "advisor_id": aid,
-                    "advisor_name": "Not Found",
-                    "message": "No data for this advisor in period"
-                })
+        comparison = [_comparison_entry(aid, advisor_perf.get(aid)) for aid in ids]
 
-        return {
-            "date_range": {
-                "start": start_date.isoformat(),
-                "end": end_date.isoformat()
-            },
+        response = {
+            "date_range": date_range,
             "comparison": comparison
         }
+        max_age = _cache_response(cache_key, response, end_date, partial)
+        return etag_response(request, response, max_age)
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
@@ -437,45 +561,90 @@ async def compare_advisors(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _goal_progress(
+    adv: AdvisorPerformance,
+    sales_goal: Optional[float],
+    gp_goal: Optional[float],
+    gp_pct_goal: Optional[float],
+    ro_goal: Optional[int]
+) -> dict:
+    """Response row for one advisor in /goals."""
+    progress = {
+        "advisor_id": adv.advisor_id,
+        "advisor_name": adv.advisor_name,
+        "current": {
+            "sales": adv.total_sales / 100,
+            "gp": adv.gross_profit / 100,
+            "gp_pct": adv.gp_percentage,
+            "ro_count": adv.ro_count
+        },
+        "progress": {}
+    }
+
+    if sales_goal:
+        sales_current = adv.total_sales / 100
+        progress["progress"]["sales"] = {
+            "goal": sales_goal,
+            "current": sales_current,
+            "percent": round(sales_current / sales_goal * 100, 1),
+            "met": sales_current >= sales_goal
+        }
+
+    if gp_goal:
+        gp_current = adv.gross_profit / 100
+        progress["progress"]["gp"] = {
+            "goal": gp_goal,
+            "current": gp_current,
+            "percent": round(gp_current / gp_goal * 100, 1),
+            "met": gp_current >= gp_goal
+        }
+
+    if gp_pct_goal:
+        progress["progress"]["gp_pct"] = {
+            "goal": gp_pct_goal,
+            "current": adv.gp_percentage,
+            "met": adv.gp_percentage >= gp_pct_goal
+        }
+
+    if ro_goal:
+        progress["progress"]["ro_count"] = {
+            "goal": ro_goal,
+            "current": adv.ro_count,
+            "percent": round(adv.ro_count / ro_goal * 100, 1),
+            "met": adv.ro_count >= ro_goal
+        }
+
+    return progress
+
+
 @router.get("/goals")
 async def check_advisor_goals(
+    request: Request,
     sales_goal: float = Query(None, description="Sales goal in dollars"),
     gp_goal: float = Query(None, description="GP goal in dollars"),
     gp_pct_goal: float = Query(None, description="GP% goal"),
     ro_goal: int = Query(None, description="RO count goal"),
-    start: str = Query(None, description="Start date (YYYY-MM-DD)"),
-    end: str = Query(None, description="End date (YYYY-MM-DD)"),
-    days: int = Query(30, description="Default days", ge=1, le=365)
+    dates: DateRange = Depends(parse_date_range)
 ):
     """
     Check advisor performance against goals.
 
     Returns progress for each advisor against specified targets.
     """
-    try:
-        # Parse dates
-        if end:
-            end_date = date.fromisoformat(end)
-        else:
-            end_date = date.today()
+    # Without a goal there is nothing to track; don't fetch or aggregate ROs
+    if sales_goal is None and gp_goal is None and gp_pct_goal is None and ro_goal is None:
+        raise HTTPException(status_code=400, detail="At least one goal parameter is required")
 
-        if start:
-            start_date = date.fromisoformat(start)
-        else:
-            start_date = end_date - timedelta(days=days)
+    try:
+        start_date, end_date = dates
+        date_range = {"start": start_date.isoformat(), "end": end_date.isoformat()}
 
         # Get RO results
-        ro_results, _ = await _get_ro_results(
-            start_date.isoformat(),
-            end_date.isoformat()
-        )
+        ro_results, advisor_perf, partial = await _get_advisor_aggregates(start_date, end_date)
 
         if not ro_results:
-            return {
-                "date_range": {
-                    "start": start_date.isoformat(),
-                    "end": end_date.isoformat()
-                },
+            response = {
+                "date_range": date_range,
                 "goals": {
                     "sales": sales_goal,
                     "gp": gp_goal,
@@ -484,65 +653,16 @@ async def check_advisor_goals(
                 },
                 "advisors": []
             }
-
-        # Aggregate
-        advisor_perf = aggregate_advisor_performance(ro_results)
+            return etag_response(request, response, 0 if partial else range_ttl(end_date))
 
         # Build goal tracking
-        advisors_progress = []
-        for adv in advisor_perf.values():
-            progress = {
-                "advisor_id": adv.advisor_id,
-                "advisor_name": adv.advisor_name,
-                "current": {
-                    "sales": cents_to_dollars(adv.total_sales),
-                    "gp": cents_to_dollars(adv.gross_profit),
-                    "gp_pct": adv.gp_percentage,
-                    "ro_count": adv.ro_count
-                },
-                "progress": {}
-            }
-
-            if sales_goal:
-                sales_current = cents_to_dollars(adv.total_sales)
-                progress["progress"]["sales"] = {
-                    "goal": sales_goal,
-                    "current": sales_current,
-                    "percent": round(sales_current / sales_goal * 100, 1),
-                    "met": sales_current >= sales_goal
-                }
-
-            if gp_goal:
-                gp_current = cents_to_dollars(adv.gross_profit)
-                progress["progress"]["gp"] = {
-                    "goal": gp_goal,
-                    "current": gp_current,
-                    "percent": round(gp_current / gp_goal * 100, 1),
-                    "met": gp_current >= gp_goal
-                }
-
-            if gp_pct_goal:
-                progress["progress"]["gp_pct"] = {
-                    "goal": gp_pct_goal,
-                    "current": adv.gp_percentage,
-                    "met": adv.gp_percentage >= gp_pct_goal
-                }
+        advisors_progress = [
+            _goal_progress(adv, sales_goal, gp_goal, gp_pct_goal, ro_goal)
+            for adv in advisor_perf.values()
+        ]
 
-            if ro_goal:
-                progress["progress"]["ro_count"] = {
-                    "goal": ro_goal,
-                    "current": adv.ro_count,
-                    "percent": round(adv.ro_count / ro_goal * 100, 1),
-                    "met": adv.ro_count >= ro_goal
-                }
-
-            advisors_progress.append(progress)
-
-        return {
-            "date_range": {
-                "start": start_date.isoformat(),
-                "end": end_date.isoformat()
-            },
+        response = {
+            "date_range": date_range,
             "goals": {
                 "sales": sales_goal,
                 "gp": gp_goal,
@@ -551,8 +671,7 @@ async def check_advisor_goals(
             },
             "advisors": advisors_progress
         }
+        return etag_response(request, response, 0 if partial else range_ttl(end_date))
 
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -9,79 +9,207 @@ Advanced analytics for GP performance tracking:
 - Fix 3.5: Enhanced variance analysis
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from datetime import datetime, timedelta
-from typing import Optional, List
+import asyncio
+from operator import itemgetter
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Optional, List, Dict, Tuple
 from app.services.tm_client import get_tm_client
+from app.services.ttl_cache import TTLCache
+from app.services.http_cache import etag_response
+from app.services.streaming import ndjson_response
 from app.services.gp_calculator import (
     calculate_ro_true_gp,
     get_shop_config,
     to_dict,
     to_dollars_dict,
     cents_to_dollars,
-    aggregate_tech_performance,
-    aggregate_parts_margin,
-    aggregate_labor_efficiency,
+    aggregate_full_analysis,
+    FullAnalysis,
     ROTrueGP
 )
 
 router = APIRouter()
 
+# Max in-flight estimate requests per RO fetch
+MAX_CONCURRENT_ESTIMATES = 10
 
-async def _get_ro_results(
+# Job board paging (MAX_BOARD_PAGES is a safety limit against endless paging)
+BOARD_PAGE_SIZE = 200
+MAX_BOARD_PAGES = 50
+
+# (ro_results, FullAnalysis) keyed by (shop_id, start_date, end_date), shared by all endpoints
+ANALYSIS_TTL_SECONDS = 60
+_analysis_cache = TTLCache(maxsize=32)
+_analysis_locks: Dict[tuple, asyncio.Lock] = {}
+# Requests holding or waiting on each _analysis_locks entry
+_analysis_lock_users: Dict[tuple, int] = {}
+
+
+def _parse_range(start: str, end: str) -> Tuple[date, date]:
+    """
+    Parse the start/end query params (YYYY-MM-DD) to dates.
+
+    Malformed input is a 400; call this outside the handler's catch-all
+    try so it isn't turned into a 500.
+    """
+    try:
+        return date.fromisoformat(start), date.fromisoformat(end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date format: {e}")
+
+
+async def _get_analysis(
     tm_client,
     shop_id: str,
     start_date,
     end_date,
     shop_config
-) -> List[ROTrueGP]:
-    """Helper to fetch and calculate RO results for a date range."""
-    all_ros = []
-    for board in ["ACTIVE", "POSTED", "COMPLETE"]:
-        try:
-            ros_page = await tm_client.get(
-                f"/api/shop/{shop_id}/job-board-group-by",
-                {"board": board, "groupBy": "NONE", "page": 0, "size": 200}
+) -> Tuple[List[ROTrueGP], FullAnalysis]:
+    """
+    Fetch RO results for a date range and aggregate them (single pass).
+
+    Cached per (shop_id, start, end) so every analytics endpoint over the
+    same range shares one fetch and one aggregation; concurrent misses for
+    the same range share one fetch. Results missing a board or estimate
+    (partial fetch) are returned but not cached.
+    """
+    cache_key = (shop_id, start_date, end_date)
+    cached = _analysis_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    lock = _analysis_locks.setdefault(cache_key, asyncio.Lock())
+    _analysis_lock_users[cache_key] = _analysis_lock_users.get(cache_key, 0) + 1
+    try:
+        async with lock:
+            # Another request may have filled the cache while we waited
+            cached = _analysis_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            ro_results, partial = await _fetch_ro_results(
+                tm_client, shop_id, start_date, end_date, shop_config
             )
-            all_ros.extend(ros_page)
-        except:
-            pass
+            result = (ro_results, aggregate_full_analysis(ro_results))
+            if not partial:
+                _analysis_cache.set(cache_key, result, ANALYSIS_TTL_SECONDS)
+            return result
+    finally:
+        # Drop the lock only once nobody holds or waits on it; popping it
+        # earlier would let a new request start a second fetch alongside
+        # the waiters still queued on this one
+        _analysis_lock_users[cache_key] -= 1
+        if not _analysis_lock_users[cache_key]:
+            del _analysis_lock_users[cache_key]
+            if _analysis_locks.get(cache_key) is lock:
+                del _analysis_locks[cache_key]
+
+
+async def _fetch_board(tm_client, shop_id: str, board: str) -> Tuple[List[dict], bool]:
+    """
+    Fetch every page of a job board (pages of BOARD_PAGE_SIZE until a short page).
+
+    Returns (board_ros, truncated); truncated is True when paging stopped at
+    MAX_BOARD_PAGES, so ROs on later pages are missing.
+    """
+    board_ros = []
+    for page in range(MAX_BOARD_PAGES):
+        ros = await tm_client.get(
+            f"/api/shop/{shop_id}/job-board-group-by",
+            {"board": board, "groupBy": "NONE", "page": page, "size": BOARD_PAGE_SIZE}
+        )
+        if not isinstance(ros, list):
+            ros = ros.get("content", []) if isinstance(ros, dict) else []
 
-    # Filter to recent ROs
+        board_ros.extend(ros)
+        # A short page is the last one
+        if len(ros) < BOARD_PAGE_SIZE:
+            return board_ros, False
+    print(f"[Analytics] {board} board hit MAX_BOARD_PAGES ({MAX_BOARD_PAGES}); later pages not fetched")
+    return board_ros, True
+
+
+async def _fetch_ro_results(
+    tm_client,
+    shop_id: str,
+    start_date,
+    end_date,
+    shop_config
+) -> Tuple[List[ROTrueGP], bool]:
+    """
+    Fetch job boards and estimates and calculate GP for ROs authorized in the range.
+
+    Returns (ro_results, partial); partial is True when a board or an
+    estimate could not be fetched, so some ROs may be missing.
+    """
+    # Fetch all boards concurrently; a failed board is skipped
+    boards = ["ACTIVE", "POSTED", "COMPLETE"]
+    pages = await asyncio.gather(
+        *(_fetch_board(tm_client, shop_id, board) for board in boards),
+        return_exceptions=True
+    )
+    # An RO in transition can sit on more than one board; keep one row per
+    # RO id (the most recently updated) so its estimate is fetched once
+    ros_by_id: Dict[Any, dict] = {}
+    fetch_errors = []
+    for board, board_ros in zip(boards, pages):
+        if isinstance(board_ros, Exception):
+            print(f"[Analytics] Error fetching {board} ROs: {board_ros}")
+            fetch_errors.append(board)
+            continue
+        if isinstance(board_ros, BaseException):
+            # Cancellation/shutdown must propagate, not count as an empty board
+            raise board_ros
+        board_ros, truncated = board_ros
+        if truncated:
+            fetch_errors.append(board)
+        for ro in board_ros:
+            prev = ros_by_id.get(ro.get("id"))
+            if prev is None or (ro.get("updatedDate") or "") > (prev.get("updatedDate") or ""):
+                ros_by_id[ro.get("id")] = ro
+    all_ros = list(ros_by_id.values())
+
+    # Filter to recent ROs (updated from 14 days before start through the day
+    # after end). updatedDate starts with its YYYY-MM-DD calendar date, so
+    # match that prefix against the window instead of parsing every timestamp.
+    window_start = start_date - timedelta(days=14)
+    valid_days = {
+        (window_start + timedelta(days=i)).isoformat()
+        for i in range((end_date - window_start).days + 2)
+    }
     recent_ros = []
     for ro in all_ros:
-        if ro.get("updatedDate"):
-            try:
-                updated_date = datetime.fromisoformat(
-                    ro["updatedDate"].replace("Z", "+00:00")
-                ).date()
-                if (start_date - timedelta(days=14)) <= updated_date <= (end_date + timedelta(days=1)):
-                    recent_ros.append(ro)
-            except:
-                pass
-
-    # Calculate GP for each RO
-    ro_results = []
-    for ro in recent_ros:
+        updated = ro.get("updatedDate")
+        if isinstance(updated, str) and updated[:10] in valid_days:
+            recent_ros.append(ro)
+
+    # YYYY-MM-DD strings order like dates, so authorizedDate prefixes can be
+    # compared without parsing
+    start_iso = start_date.isoformat()
+    end_iso = end_date.isoformat()
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_ESTIMATES)
+
+    async def _calculate(ro: dict) -> Optional[ROTrueGP]:
         try:
-            estimate = await tm_client.get(f"/api/repair-order/{ro['id']}/estimate")
+            async with semaphore:
+                estimate = await tm_client.get(f"/api/repair-order/{ro['id']}/estimate")
 
-            # Check for authorized jobs in date range
+            # Check for authorized jobs in date range (ISO day prefix compare)
             has_auth_in_range = False
             for job in estimate.get("jobs", []):
-                if job.get("authorized") and job.get("authorizedDate"):
-                    try:
-                        auth_date = datetime.fromisoformat(
-                            job["authorizedDate"].replace("Z", "+00:00")
-                        ).date()
-                        if start_date <= auth_date <= end_date:
-                            has_auth_in_range = True
-                            break
-                    except:
-                        pass
+                authorized_date = job.get("authorizedDate")
+                if (
+                    job.get("authorized")
+                    and isinstance(authorized_date, str)
+                    and start_iso <= authorized_date[:10] <= end_iso
+                ):
+                    has_auth_in_range = True
+                    break
 
             if not has_auth_in_range:
-                continue
+                return None
 
             ro_gp = calculate_ro_true_gp(
                 estimate,
@@ -89,86 +217,296 @@ async def _get_ro_results(
                 authorized_only=True
             )
 
-            if ro_gp.total_retail > 0:
-                ro_results.append(ro_gp)
+            return ro_gp if ro_gp.total_retail > 0 else None
 
         except Exception as e:
             print(f"[Analytics] Error processing RO {ro.get('id')}: {e}")
-            continue
+            fetch_errors.append(ro.get("id"))
+            return None
 
-    return ro_results
+    # Estimate fetches dominate; run them concurrently (bounded), keeping RO order
+    calculated = await asyncio.gather(*(_calculate(ro) for ro in recent_ros))
+    ro_results = [ro_gp for ro_gp in calculated if ro_gp is not None]
 
+    return ro_results, bool(fetch_errors)
 
-@router.get("/tech-performance")
-async def get_tech_performance(
-    start: str = Query(..., description="Start date (YYYY-MM-DD)"),
-    end: str = Query(..., description="End date (YYYY-MM-DD)")
-):
+
+@router.post("/cache/clear")
+async def clear_analytics_cache():
     """
-    Tier 3: Get technician performance metrics.
+    Drop cached RO results/aggregates so the next request refetches from TM.
+    """
+    _analysis_cache.clear()
+    return {"cleared": True}
+
+
+# ============== Response Views ==============
+#
+# Each endpoint's payload is a projection of the same cached (ro_results,
+# FullAnalysis) pair, so /bundle can return them all from one computation.
+
+def _tech_performance_view(ro_results: List[ROTrueGP], analysis: FullAnalysis) -> dict:
+    """Body of /tech-performance."""
+    # Convert to response format
+    tech_list = [
+        {
+            "tech_id": perf.tech_id,
+            "tech_name": perf.tech_name,
+            "hourly_rate": cents_to_dollars(perf.hourly_rate),
+            "hours_billed": perf.hours_billed,
+            "labor_revenue": cents_to_dollars(perf.labor_revenue),
+            "labor_cost": cents_to_dollars(perf.labor_cost),
+            "labor_profit": cents_to_dollars(perf.labor_profit),
+            "labor_margin_pct": perf.labor_margin_pct,
+            "gp_per_hour": cents_to_dollars(perf.gp_per_hour),
+            "jobs_worked": perf.jobs_worked,
+            "ros_worked": perf.ros_worked,
+            "rate_source_counts": perf.rate_source_counts
+        }
+        for perf in analysis.tech_performance.values()
+    ]
+
+    # Sort by profit descending
+    tech_list.sort(key=itemgetter("labor_profit"), reverse=True)
+
+    return {
+        "technicians": tech_list,
+        "summary": {
+            "tech_count": len(tech_list),
+            "total_hours": sum(t['hours_billed'] for t in tech_list),
+            "total_labor_revenue": sum(t['labor_revenue'] for t in tech_list),
+            "total_labor_profit": sum(t['labor_profit'] for t in tech_list),
+            "ros_analyzed": len(ro_results)
+        },
+        "source": "TRUE_GP_TIER3"
+    }
+
+
+def _parts_margin_view(ro_results: List[ROTrueGP], analysis: FullAnalysis) -> dict:
+    """Body of /parts-margin."""
+    parts_analysis = analysis.parts_margin
+
+    # Convert highest/lowest to dollars
+    def convert_part(p):
+        return {
+            'name': p['name'],
+            'quantity': p['quantity'],
+            'cost': cents_to_dollars(p['cost']),
+            'retail': cents_to_dollars(p['retail']),
+            'profit': cents_to_dollars(p['profit']),
+            'margin_pct': p['margin_pct']
+        }
 
-    Returns profit metrics per technician including:
-    - Hours billed
-    - Labor revenue and cost
-    - Labor profit and margin %
-    - GP per hour
-    - Jobs and ROs worked
+    return {
+        "summary": {
+            "total_retail": cents_to_dollars(parts_analysis.total_parts_retail),
+            "total_cost": cents_to_dollars(parts_analysis.total_parts_cost),
+            "total_profit": cents_to_dollars(parts_analysis.total_parts_profit),
+            "overall_margin_pct": parts_analysis.overall_margin_pct,
+            "total_line_items": parts_analysis.total_line_items,
+            "avg_quantity": parts_analysis.avg_quantity
+        },
+        "by_quantity": {
+            "single_items": {
+                "count": parts_analysis.single_items.get('count', 0),
+                "retail": cents_to_dollars(parts_analysis.single_items.get('retail', 0)),
+                "cost": cents_to_dollars(parts_analysis.single_items.get('cost', 0)),
+                "profit": cents_to_dollars(parts_analysis.single_items.get('profit', 0)),
+                "margin_pct": parts_analysis.single_items.get('margin_pct', 0)
+            },
+            "multi_items": {
+                "count": parts_analysis.multi_items.get('count', 0),
+                "retail": cents_to_dollars(parts_analysis.multi_items.get('retail', 0)),
+                "cost": cents_to_dollars(parts_analysis.multi_items.get('cost', 0)),
+                "profit": cents_to_dollars(parts_analysis.multi_items.get('profit', 0)),
+                "margin_pct": parts_analysis.multi_items.get('margin_pct', 0)
+            }
+        },
+        "highest_margin_parts": [convert_part(p) for p in parts_analysis.highest_margin_parts],
+        "lowest_margin_parts": [convert_part(p) for p in parts_analysis.lowest_margin_parts],
+        "ros_analyzed": len(ro_results),
+        "source": "TRUE_GP_TIER3"
+    }
+
+
+def _labor_efficiency_view(ro_results: List[ROTrueGP], analysis: FullAnalysis) -> dict:
+    """Body of /labor-efficiency."""
+    labor_eff = analysis.labor_efficiency
+
+    # Convert rate sources to dollars
+    by_source = {}
+    for source, data in labor_eff.by_rate_source.items():
+        by_source[source] = {
+            'hours': round(data['hours'], 2),
+            'revenue': cents_to_dollars(data['revenue']),
+            'cost': cents_to_dollars(data['cost']),
+            'profit': cents_to_dollars(data['revenue'] - data['cost']),
+            'margin_pct': data.get('margin_pct', 0),
+            'count': data['count']
+        }
+
+    return {
+        "summary": {
+            "total_hours_billed": labor_eff.total_hours_billed,
+            "total_revenue": cents_to_dollars(labor_eff.total_labor_revenue),
+            "total_cost": cents_to_dollars(labor_eff.total_labor_cost),
+            "total_profit": cents_to_dollars(labor_eff.total_labor_profit),
+            "overall_margin_pct": labor_eff.overall_margin_pct,
+            "total_labor_items": labor_eff.total_labor_items
+        },
+        "rates": {
+            "avg_retail_rate": cents_to_dollars(labor_eff.avg_retail_rate),
+            "avg_tech_cost_rate": cents_to_dollars(labor_eff.avg_tech_cost_rate),
+            "effective_spread": cents_to_dollars(labor_eff.effective_spread),
+            "gp_per_hour": cents_to_dollars(labor_eff.gp_per_hour)
+        },
+        "by_rate_source": by_source,
+        "rate_source_note": {
+            "assigned": "Tech rate from labor assignment",
+            "shop_average": "Fallback to shop average tech rate",
+            "default": "Fallback to $25/hr default"
+        },
+        "ros_analyzed": len(ro_results),
+        "source": "TRUE_GP_TIER3"
+    }
+
+
+def _full_analysis_view(ro_results: List[ROTrueGP], analysis: FullAnalysis) -> dict:
+    """Body of /full-analysis."""
+    total_sales = analysis.total_sales
+    total_cost = analysis.total_cost
+    total_gp = analysis.total_gp
+    total_fee_profit = analysis.total_fee_profit
+
+    tech_perf = analysis.tech_performance
+    parts_analysis = analysis.parts_margin
+    labor_eff = analysis.labor_efficiency
+
+    # Top techs
+    top_techs = sorted(
+        [{"name": p.tech_name, "profit": cents_to_dollars(p.labor_profit), "hours": p.hours_billed}
+         for p in tech_perf.values()],
+        key=lambda x: x['profit'],
+        reverse=True
+    )[:5]
+
+    return {
+        "summary": {
+            "total_sales": cents_to_dollars(total_sales),
+            "total_cost": cents_to_dollars(total_cost),
+            "gross_profit": cents_to_dollars(total_gp),
+            "gp_percentage": round(total_gp / total_sales * 100, 2) if total_sales > 0 else 0,
+            "car_count": len(ro_results),
+            "aro": cents_to_dollars(total_sales // len(ro_results)) if ro_results else 0
+        },
+        "category_breakdown": {
+            "parts": {
+                "revenue": cents_to_dollars(parts_analysis.total_parts_retail),
+                "cost": cents_to_dollars(parts_analysis.total_parts_cost),
+                "profit": cents_to_dollars(parts_analysis.total_parts_profit),
+                "margin_pct": parts_analysis.overall_margin_pct
+            },
+            "labor": {
+                "revenue": cents_to_dollars(labor_eff.total_labor_revenue),
+                "cost": cents_to_dollars(labor_eff.total_labor_cost),
+                "profit": cents_to_dollars(labor_eff.total_labor_profit),
+                "margin_pct": labor_eff.overall_margin_pct,
+                "hours": labor_eff.total_hours_billed
+            },
+            "fees": {
+                "revenue": cents_to_dollars(total_fee_profit),
+                "cost": 0,
+                "profit": cents_to_dollars(total_fee_profit),
+                "margin_pct": 100.0
+            }
+        },
+        "top_technicians": top_techs,
+        "labor_rate_effectiveness": {
+            "avg_retail_rate": cents_to_dollars(labor_eff.avg_retail_rate),
+            "avg_cost_rate": cents_to_dollars(labor_eff.avg_tech_cost_rate),
+            "spread": cents_to_dollars(labor_eff.effective_spread),
+            "gp_per_hour": cents_to_dollars(labor_eff.gp_per_hour)
+        },
+        "parts_insights": {
+            "total_line_items": parts_analysis.total_line_items,
+            "avg_quantity": parts_analysis.avg_quantity,
+            "multi_qty_items": parts_analysis.multi_items.get('count', 0)
+        },
+        "source": "TRUE_GP_TIER3"
+    }
+
+
+def _bundle_view(ro_results: List[ROTrueGP], analysis: FullAnalysis) -> dict:
+    """Body of /bundle: every RO-derived view, keyed by endpoint."""
+    return {
+        "tech_performance": _tech_performance_view(ro_results, analysis),
+        "parts_margin": _parts_margin_view(ro_results, analysis),
+        "labor_efficiency": _labor_efficiency_view(ro_results, analysis),
+        "full_analysis": _full_analysis_view(ro_results, analysis)
+    }
+
+
+async def _analysis_response(
+    request: Request,
+    start: str,
+    end: str,
+    view: Callable[[List[ROTrueGP], FullAnalysis], dict],
+    stream: bool = False
+) -> Response:
+    """
+    Shared handler body: load the cached analysis for start/end and render one view.
+
+    With stream, the response is NDJSON: a header line (date_range,
+    calculated_at), then one {"section", "data"} line per top-level key.
     """
+    start_date, end_date = _parse_range(start, end)
+
     tm = get_tm_client()
     await tm._ensure_token()
     shop_id = tm.get_shop_id()
 
     try:
         shop_config = await get_shop_config(tm, shop_id)
-        start_date = datetime.fromisoformat(start).date()
-        end_date = datetime.fromisoformat(end).date()
-
-        ro_results = await _get_ro_results(tm, shop_id, start_date, end_date, shop_config)
-
-        # Aggregate tech performance
-        tech_perf = aggregate_tech_performance(ro_results)
-
-        # Convert to response format
-        tech_list = []
-        for tech_id, perf in tech_perf.items():
-            tech_list.append({
-                "tech_id": perf.tech_id,
-                "tech_name": perf.tech_name,
-                "hourly_rate": cents_to_dollars(perf.hourly_rate),
-                "hours_billed": perf.hours_billed,
-                "labor_revenue": cents_to_dollars(perf.labor_revenue),
-                "labor_cost": cents_to_dollars(perf.labor_cost),
-                "labor_profit": cents_to_dollars(perf.labor_profit),
-                "labor_margin_pct": perf.labor_margin_pct,
-                "gp_per_hour": cents_to_dollars(perf.gp_per_hour),
-                "jobs_worked": perf.jobs_worked,
-                "ros_worked": perf.ros_worked,
-                "rate_source_counts": perf.rate_source_counts
-            })
-
-        # Sort by profit descending
-        tech_list.sort(key=lambda x: x['labor_profit'], reverse=True)
+        ro_results, analysis = await _get_analysis(tm, shop_id, start_date, end_date, shop_config)
 
-        return {
+        body = view(ro_results, analysis)
+        if stream:
+            header = {"date_range": {"start": start, "end": end}, "calculated_at": datetime.now().isoformat()}
+            return ndjson_response(header, ({"section": k, "data": v} for k, v in body.items()))
+
+        response = {
             "date_range": {"start": start, "end": end},
-            "technicians": tech_list,
-            "summary": {
-                "tech_count": len(tech_list),
-                "total_hours": sum(t['hours_billed'] for t in tech_list),
-                "total_labor_revenue": sum(t['labor_revenue'] for t in tech_list),
-                "total_labor_profit": sum(t['labor_profit'] for t in tech_list),
-                "ros_analyzed": len(ro_results)
-            },
-            "source": "TRUE_GP_TIER3",
+            **body,
             "calculated_at": datetime.now().isoformat()
         }
+        return etag_response(request, response, ANALYSIS_TTL_SECONDS, etag_exclude=("calculated_at",))
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/tech-performance")
+async def get_tech_performance(
+    request: Request,
+    start: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end: str = Query(..., description="End date (YYYY-MM-DD)")
+):
+    """
+    Tier 3: Get technician performance metrics.
+
+    Returns profit metrics per technician including:
+    - Hours billed
+    - Labor revenue and cost
+    - Labor profit and margin %
+    - GP per hour
+    - Jobs and ROs worked
+    """
+    return await _analysis_response(request, start, end, _tech_performance_view)
+
+
 @router.get("/parts-margin")
 async def get_parts_margin_analysis(
+    request: Request,
     start: str = Query(..., description="Start date (YYYY-MM-DD)"),
     end: str = Query(..., description="End date (YYYY-MM-DD)")
 ):
@@ -181,70 +519,12 @@ async def get_parts_margin_analysis(
     - Highest and lowest margin parts
     - Quantity distribution
     """
-    tm = get_tm_client()
-    await tm._ensure_token()
-    shop_id = tm.get_shop_id()
-
-    try:
-        shop_config = await get_shop_config(tm, shop_id)
-        start_date = datetime.fromisoformat(start).date()
-        end_date = datetime.fromisoformat(end).date()
-
-        ro_results = await _get_ro_results(tm, shop_id, start_date, end_date, shop_config)
-
-        # Aggregate parts margin
-        parts_analysis = aggregate_parts_margin(ro_results)
-
-        # Convert highest/lowest to dollars
-        def convert_part(p):
-            return {
-                'name': p['name'],
-                'quantity': p['quantity'],
-                'cost': cents_to_dollars(p['cost']),
-                'retail': cents_to_dollars(p['retail']),
-                'profit': cents_to_dollars(p['profit']),
-                'margin_pct': p['margin_pct']
-            }
-
-        return {
-            "date_range": {"start": start, "end": end},
-            "summary": {
-                "total_retail": cents_to_dollars(parts_analysis.total_parts_retail),
-                "total_cost": cents_to_dollars(parts_analysis.total_parts_cost),
-                "total_profit": cents_to_dollars(parts_analysis.total_parts_profit),
-                "overall_margin_pct": parts_analysis.overall_margin_pct,
-                "total_line_items": parts_analysis.total_line_items,
-                "avg_quantity": parts_analysis.avg_quantity
-            },
-            "by_quantity": {
-                "single_items": {
-                    "count": parts_analysis.single_items.get('count', 0),
-                    "retail": cents_to_dollars(parts_analysis.single_items.get('retail', 0)),
-                    "cost": cents_to_dollars(parts_analysis.single_items.get('cost', 0)),
-                    "profit": cents_to_dollars(parts_analysis.single_items.get('profit', 0)),
-                    "margin_pct": parts_analysis.single_items.get('margin_pct', 0)
-                },
-                "multi_items": {
-                    "count": parts_analysis.multi_items.get('count', 0),
-                    "retail": cents_to_dollars(parts_analysis.multi_items.get('retail', 0)),
-                    "cost": cents_to_dollars(parts_analysis.multi_items.get('cost', 0)),
-                    "profit": cents_to_dollars(parts_analysis.multi_items.get('profit', 0)),
-                    "margin_pct": parts_analysis.multi_items.get('margin_pct', 0)
-                }
-            },
-            "highest_margin_parts": [convert_part(p) for p in parts_analysis.highest_margin_parts],
-            "lowest_margin_parts": [convert_part(p) for p in parts_analysis.lowest_margin_parts],
-            "ros_analyzed": len(ro_results),
-            "source": "TRUE_GP_TIER3",
-            "calculated_at": datetime.now().isoformat()
-        }
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await _analysis_response(request, start, end, _parts_margin_view)
 
 
 @router.get("/labor-efficiency")
 async def get_labor_efficiency(
+    request: Request,
     start: str = Query(..., description="Start date (YYYY-MM-DD)"),
     end: str = Query(..., description="End date (YYYY-MM-DD)")
 ):
@@ -257,65 +537,12 @@ async def get_labor_efficiency(
     - Effective spread (retail - cost)
     - Breakdown by rate source (assigned, shop_average, default)
     """
-    tm = get_tm_client()
-    await tm._ensure_token()
-    shop_id = tm.get_shop_id()
-
-    try:
-        shop_config = await get_shop_config(tm, shop_id)
-        start_date = datetime.fromisoformat(start).date()
-        end_date = datetime.fromisoformat(end).date()
-
-        ro_results = await _get_ro_results(tm, shop_id, start_date, end_date, shop_config)
-
-        # Aggregate labor efficiency
-        labor_eff = aggregate_labor_efficiency(ro_results)
-
-        # Convert rate sources to dollars
-        by_source = {}
-        for source, data in labor_eff.by_rate_source.items():
-            by_source[source] = {
-                'hours': round(data['hours'], 2),
-                'revenue': cents_to_dollars(data['revenue']),
-                'cost': cents_to_dollars(data['cost']),
-                'profit': cents_to_dollars(data['revenue'] - data['cost']),
-                'margin_pct': data.get('margin_pct', 0),
-                'count': data['count']
-            }
-
-        return {
-            "date_range": {"start": start, "end": end},
-            "summary": {
-                "total_hours_billed": labor_eff.total_hours_billed,
-                "total_revenue": cents_to_dollars(labor_eff.total_labor_revenue),
-                "total_cost": cents_to_dollars(labor_eff.total_labor_cost),
-                "total_profit": cents_to_dollars(labor_eff.total_labor_profit),
-                "overall_margin_pct": labor_eff.overall_margin_pct,
-                "total_labor_items": labor_eff.total_labor_items
-            },
-            "rates": {
-                "avg_retail_rate": cents_to_dollars(labor_eff.avg_retail_rate),
-                "avg_tech_cost_rate": cents_to_dollars(labor_eff.avg_tech_cost_rate),
-                "effective_spread": cents_to_dollars(labor_eff.effective_spread),
-                "gp_per_hour": cents_to_dollars(int(labor_eff.total_labor_profit / labor_eff.total_hours_billed)) if labor_eff.total_hours_billed > 0 else 0
-            },
-            "by_rate_source": by_source,
-            "rate_source_note": {
-                "assigned": "Tech rate from labor assignment",
-                "shop_average": "Fallback to shop average tech rate",
-                "default": "Fallback to $25/hr default"
-            },
-            "ros_analyzed": len(ro_results),
-            "source": "TRUE_GP_TIER3",
-            "calculated_at": datetime.now().isoformat()
-        }
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await _analysis_response(request, start, end, _labor_efficiency_view)
 
 
 @router.get("/variance-analysis")
 async def get_variance_analysis(
+    request: Request,
     start: str = Query(..., description="Start date (YYYY-MM-DD)"),
     end: str = Query(..., description="End date (YYYY-MM-DD)")
 ):
@@ -328,6 +555,8 @@ async def get_variance_analysis(
 
     Returns detailed variance breakdown with explanations.
     """
+    start_date, end_date = _parse_range(start, end)
+
     tm = get_tm_client()
     await tm._ensure_token()
     shop_id = tm.get_shop_id()
@@ -355,15 +584,13 @@ async def get_variance_analysis(
 
         # Get true calculations
         shop_config = await get_shop_config(tm, shop_id)
-        start_date = datetime.fromisoformat(start).date()
-        end_date = datetime.fromisoformat(end).date()
-
-        ro_results = await _get_ro_results(tm, shop_id, start_date, end_date, shop_config)
+        ro_results, analysis = await _get_analysis(tm, shop_id, start_date, end_date, shop_config)
 
         # Aggregate true metrics
-        true_sales = sum(ro.total_retail for ro in ro_results)
-        true_cost = sum(ro.total_cost for ro in ro_results)
-        true_gp = sum(ro.gross_profit for ro in ro_results)
+        # (totals come from the cached single-pass analysis)
+        true_sales = analysis.total_sales
+        true_cost = analysis.total_cost
+        true_gp = analysis.total_gp
         true_car_count = len(ro_results)
         true_gp_pct = (true_gp / true_sales * 100) if true_sales > 0 else 0
         true_aro = (true_sales // true_car_count) if true_car_count > 0 else 0
@@ -392,7 +619,7 @@ async def get_variance_analysis(
             )
 
         # Check rate source distribution
-        labor_eff = aggregate_labor_efficiency(ro_results)
+        labor_eff = analysis.labor_efficiency
         assigned_count = labor_eff.by_rate_source.get('assigned', {}).get('count', 0)
         fallback_count = (
             labor_eff.by_rate_source.get('shop_average', {}).get('count', 0) +
@@ -405,7 +632,7 @@ async def get_variance_analysis(
             )
 
         # Check parts quantity issues
-        parts_analysis = aggregate_parts_margin(ro_results)
+        parts_analysis = analysis.parts_margin
         multi_count = parts_analysis.multi_items.get('count', 0)
         if multi_count > 0:
             variance_reasons.append(
@@ -413,13 +640,13 @@ async def get_variance_analysis(
             )
 
         # Fee profit
-        total_fee_profit = sum(ro.fee_profit for ro in ro_results)
+        total_fee_profit = analysis.total_fee_profit
         if total_fee_profit > 0:
             variance_reasons.append(
                 f"Fee profit of ${total_fee_profit/100:.2f} included (100% margin) - may not match TM GP"
             )
 
-        return {
+        response = {
             "date_range": {"start": start, "end": end},
             "tm_aggregates": {
                 "sales": cents_to_dollars(tm_sold),
@@ -457,6 +684,7 @@ async def get_variance_analysis(
             },
             "calculated_at": datetime.now().isoformat()
         }
+        return etag_response(request, response, ANALYSIS_TTL_SECONDS, etag_exclude=("calculated_at",))
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -464,8 +692,10 @@ async def get_variance_analysis(
 
 @router.get("/full-analysis")
 async def get_full_analysis(
+    request: Request,
     start: str = Query(..., description="Start date (YYYY-MM-DD)"),
-    end: str = Query(..., description="End date (YYYY-MM-DD)")
+    end: str = Query(..., description="End date (YYYY-MM-DD)"),
+    stream: bool = Query(False, description="Stream as NDJSON, one line per section")
 ):
     """
     Tier 3: Complete analysis combining all metrics.
@@ -477,80 +707,22 @@ async def get_full_analysis(
     - Labor efficiency
     - Category breakdowns
     """
-    tm = get_tm_client()
-    await tm._ensure_token()
-    shop_id = tm.get_shop_id()
-
-    try:
-        shop_config = await get_shop_config(tm, shop_id)
-        start_date = datetime.fromisoformat(start).date()
-        end_date = datetime.fromisoformat(end).date()
-
-        ro_results = await _get_ro_results(tm, shop_id, start_date, end_date, shop_config)
+    return await _analysis_response(request, start, end, _full_analysis_view, stream=stream)
 
-        # Aggregate all metrics
-        total_sales = sum(ro.total_retail for ro in ro_results)
-        total_cost = sum(ro.total_cost for ro in ro_results)
-        total_gp = sum(ro.gross_profit for ro in ro_results)
 
-        tech_perf = aggregate_tech_performance(ro_results)
-        parts_analysis = aggregate_parts_margin(ro_results)
-        labor_eff = aggregate_labor_efficiency(ro_results)
-
-        # Top techs
-        top_techs = sorted(
-            [{"name": p.tech_name, "profit": cents_to_dollars(p.labor_profit), "hours": p.hours_billed}
-             for p in tech_perf.values()],
-            key=lambda x: x['profit'],
-            reverse=True
-        )[:5]
-
-        return {
-            "date_range": {"start": start, "end": end},
-            "summary": {
-                "total_sales": cents_to_dollars(total_sales),
-                "total_cost": cents_to_dollars(total_cost),
-                "gross_profit": cents_to_dollars(total_gp),
-                "gp_percentage": round(total_gp / total_sales * 100, 2) if total_sales > 0 else 0,
-                "car_count": len(ro_results),
-                "aro": cents_to_dollars(total_sales // len(ro_results)) if ro_results else 0
-            },
-            "category_breakdown": {
-                "parts": {
-                    "revenue": cents_to_dollars(parts_analysis.total_parts_retail),
-                    "cost": cents_to_dollars(parts_analysis.total_parts_cost),
-                    "profit": cents_to_dollars(parts_analysis.total_parts_profit),
-                    "margin_pct": parts_analysis.overall_margin_pct
-                },
-                "labor": {
-                    "revenue": cents_to_dollars(labor_eff.total_labor_revenue),
-                    "cost": cents_to_dollars(labor_eff.total_labor_cost),
-                    "profit": cents_to_dollars(labor_eff.total_labor_profit),
-                    "margin_pct": labor_eff.overall_margin_pct,
-                    "hours": labor_eff.total_hours_billed
-                },
-                "fees": {
-                    "revenue": cents_to_dollars(sum(ro.fee_profit for ro in ro_results)),
-                    "cost": 0,
-                    "profit": cents_to_dollars(sum(ro.fee_profit for ro in ro_results)),
-                    "margin_pct": 100.0
-                }
-            },
-            "top_technicians": top_techs,
-            "labor_rate_effectiveness": {
-                "avg_retail_rate": cents_to_dollars(labor_eff.avg_retail_rate),
-                "avg_cost_rate": cents_to_dollars(labor_eff.avg_tech_cost_rate),
-                "spread": cents_to_dollars(labor_eff.effective_spread),
-                "gp_per_hour": cents_to_dollars(int(labor_eff.total_labor_profit / labor_eff.total_hours_billed)) if labor_eff.total_hours_billed > 0 else 0
-            },
-            "parts_insights": {
-                "total_line_items": parts_analysis.total_line_items,
-                "avg_quantity": parts_analysis.avg_quantity,
-                "multi_qty_items": parts_analysis.multi_items.get('count', 0)
-            },
-            "source": "TRUE_GP_TIER3",
-            "calculated_at": datetime.now().isoformat()
-        }
+@router.get("/bundle")
+async def get_analytics_bundle(
+    request: Request,
+    start: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end: str = Query(..., description="End date (YYYY-MM-DD)"),
+    stream: bool = Query(False, description="Stream as NDJSON, one line per section")
+):
+    """
+    Tier 3: Tech performance, parts margin, labor efficiency and full
+    analysis in one response.
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    Same bodies as the individual endpoints (keyed tech_performance,
+    parts_margin, labor_efficiency, full_analysis), computed from one
+    shared analysis - for dashboards that render every panel.
+    """
+    return await _analysis_response(request, start, end, _bundle_view, stream=stream)
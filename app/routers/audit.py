@@ -4,27 +4,133 @@ Data Audit Endpoints
 Systematic audit of RO data across all endpoints to identify discrepancies.
 """
 
+import asyncio
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from app.services.tm_client import get_tm_client
+from app.services.ttl_cache import TTLCache
+from app.services.streaming import ndjson_response
 
 router = APIRouter()
 
+JOB_BOARDS = ["ACTIVE", "POSTED", "COMPLETE"]
+
+# Each RO audit issues several TM GETs; cap how many ROs are in flight at once
+MAX_CONCURRENT_RO_AUDITS = 20
+
+# Days audited at once by /date-range (each day fans out its own RO audits)
+MAX_CONCURRENT_AUDIT_DAYS = 4
+
+# In-flight TM GETs keyed by (path, params), shared by concurrent callers
+_inflight_gets: Dict[tuple, asyncio.Future] = {}
+
+# Finished audits of past days, keyed by ISO date. Past days still drift
+# (estimates get edited), so they're cached for an hour, not indefinitely.
+COMPLETED_DAY_TTL_SECONDS = 60 * 60
+_daily_cache = TTLCache(maxsize=400)
+
 
 def cents_to_dollars(cents: int) -> float:
     """Convert cents to dollars"""
     return round((cents or 0) / 100, 2)
 
 
-def safe_get(obj: dict, *keys, default=0):
-    """Safely get nested dict values"""
-    for key in keys:
-        if isinstance(obj, dict):
-            obj = obj.get(key, default)
-        else:
-            return default
-    return obj if obj is not None else default
+def parse_audit_date(value: str):
+    """
+    Parse a YYYY-MM-DD (or full ISO timestamp) query param to a date.
+
+    Malformed input is a 400 instead of an unhandled ValueError (500).
+    """
+    try:
+        return datetime.fromisoformat(value).date()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date format: {e}")
+
+
+def activity_days(ro_summary: dict) -> frozenset:
+    """
+    ISO days (YYYY-MM-DD) the RO was updated, posted or created on.
+
+    TM timestamps start with their calendar date, so this takes that prefix
+    instead of parsing. Computed once per board row and stored as
+    "_activity_days", so filtering against one or many days is a set lookup.
+    """
+    return frozenset(
+        date_str[:10]
+        for date_str in (
+            ro_summary.get("updatedDate"),
+            ro_summary.get("postedDate"),
+            ro_summary.get("createdDate")
+        )
+        if isinstance(date_str, str)
+    )
+
+
+async def fetch_job_boards(tm, shop_id: str) -> list:
+    """
+    Fetch every job board concurrently, in JOB_BOARDS order.
+
+    A board that fails comes back as its Exception so callers can record it
+    and carry on with the others.
+    """
+    pages = await asyncio.gather(
+        *(
+            tm.get(
+                f"/api/shop/{shop_id}/job-board-group-by",
+                {"board": board, "groupBy": "NONE", "page": 0, "size": 500}
+            )
+            for board in JOB_BOARDS
+        ),
+        return_exceptions=True
+    )
+    for page in pages:
+        if isinstance(page, BaseException) and not isinstance(page, Exception):
+            # Cancellation/shutdown must propagate, not count as a failed board
+            raise page
+    return pages
+
+
+async def get_coalesced(tm, path: str, params: Optional[Dict] = None) -> Any:
+    """
+    GET from TM, joining an identical request that is already in flight.
+
+    Overlapping audits (e.g. /today and /daily during a dashboard refresh)
+    hit the same RO endpoints; this issues one request and hands every
+    caller the same parsed body, so callers must not mutate it.
+    """
+    key = (path, tuple(sorted(params.items())) if params else None)
+    future = _inflight_gets.get(key)
+    if future is None:
+        future = asyncio.ensure_future(tm.get(path, params))
+        _inflight_gets[key] = future
+        future.add_done_callback(lambda _: _inflight_gets.pop(key, None))
+    # Shield so one caller being cancelled doesn't cancel the shared request
+    return await asyncio.shield(future)
+
+
+async def fetch_ro_sources(tm, ro_id, include_basic: bool = True) -> tuple:
+    """
+    Fetch an RO's estimate, profit/labor and basic RO data concurrently.
+
+    Returns (estimate, profit_labor, ro_basic); an endpoint that failed
+    comes back as its Exception. With include_basic=False the basic RO
+    endpoint is skipped and ro_basic is None.
+    """
+    fetches = [
+        get_coalesced(tm, f"/api/repair-order/{ro_id}/estimate"),
+        get_coalesced(tm, f"/api/repair-order/{ro_id}/profit/labor")
+    ]
+    if include_basic:
+        fetches.append(get_coalesced(tm, f"/api/repair-order/{ro_id}"))
+    sources = await asyncio.gather(*fetches, return_exceptions=True)
+    for source in sources:
+        if isinstance(source, BaseException) and not isinstance(source, Exception):
+            raise source
+    if not include_basic:
+        sources.append(None)
+    return tuple(sources)
 
 
 @router.get("/daily")
@@ -36,16 +142,89 @@ async def audit_daily_ros(
 
     Fetches from multiple endpoints, compares values, and identifies discrepancies.
     """
-    tm = get_tm_client()
-    await tm._ensure_token()
-    shop_id = tm.get_shop_id()
-
     # Default to today
     if date:
-        audit_date = datetime.fromisoformat(date).date()
+        audit_date = parse_audit_date(date)
     else:
         audit_date = datetime.now().date()
 
+    tm = get_tm_client()
+    await tm._ensure_token()
+    shop_id = tm.get_shop_id()
+
+    audit_results = await run_daily_audit(tm, shop_id, audit_date)
+
+    # Past days are final unless part of the audit failed (see endpoint_trust)
+    headers = None
+    if audit_date < datetime.now().date() and not audit_results["endpoint_trust"]:
+        headers = {"Cache-Control": f"private, max-age={COMPLETED_DAY_TTL_SECONDS}"}
+
+    # Audit payloads are plain JSON types; hand them straight to orjson rather
+    # than letting FastAPI walk the whole tree through jsonable_encoder first
+    return ORJSONResponse(audit_results, headers=headers)
+
+
+def cached_day_audit(audit_date) -> Optional[dict]:
+    """Cached audit for a past day, or None (today is never cached)"""
+    if audit_date < datetime.now().date():
+        return _daily_cache.get(audit_date.isoformat())
+    return None
+
+
+async def fetch_audit_ros(tm, shop_id: str) -> Tuple[List[dict], Dict[str, str]]:
+    """
+    Fetch all job boards once and return (unique_ros, board_errors).
+
+    ROs are deduplicated by ID (first board wins) and tagged with "_board"
+    and "_activity_days". board_errors maps "job-board-<BOARD>" to the
+    error for any board that failed, in endpoint_trust format.
+    """
+    all_ros = []
+    board_errors: Dict[str, str] = {}
+    for board, ros_page in zip(JOB_BOARDS, await fetch_job_boards(tm, shop_id)):
+        if isinstance(ros_page, Exception):
+            board_errors[f"job-board-{board}"] = f"ERROR: {str(ros_page)}"
+            continue
+        for ro in ros_page:
+            ro["_board"] = board
+        all_ros.extend(ros_page)
+
+    # Deduplicate by RO ID, keeping the first board an RO appears on
+    ros_by_id: Dict[Any, dict] = {}
+    for ro in all_ros:
+        ro_id = ro.get("id")
+        if ro_id:
+            ros_by_id.setdefault(ro_id, ro)
+    unique_ros = list(ros_by_id.values())
+    for ro in unique_ros:
+        ro["_activity_days"] = activity_days(ro)
+
+    return unique_ros, board_errors
+
+
+async def run_daily_audit(
+    tm,
+    shop_id: str,
+    audit_date,
+    ro_cache: Optional[dict] = None,
+    boards: Optional[Tuple[List[dict], Dict[str, str]]] = None,
+    ro_semaphore: Optional[asyncio.Semaphore] = None
+) -> dict:
+    """
+    Audit every RO with activity on audit_date.
+
+    Pass the same ro_cache to several calls (as /date-range does) so an RO
+    active on more than one day is only audited once, pass boards (from
+    fetch_audit_ros) to reuse one board fetch across days, and pass one
+    ro_semaphore so concurrent days share the MAX_CONCURRENT_RO_AUDITS
+    limit. Complete audits of past days are served from _daily_cache.
+    """
+    day_key = audit_date.isoformat()
+    is_past_day = audit_date < datetime.now().date()
+    cached = cached_day_audit(audit_date)
+    if cached is not None:
+        return cached
+
     audit_results = {
         "audit_date": audit_date.isoformat(),
         "audit_timestamp": datetime.now().isoformat(),
@@ -66,64 +245,56 @@ async def audit_daily_ros(
     }
 
     try:
-        # Fetch ROs from all boards
-        all_ros = []
-        for board in ["ACTIVE", "POSTED", "COMPLETE"]:
-            try:
-                ros_page = await tm.get(
-                    f"/api/shop/{shop_id}/job-board-group-by",
-                    {"board": board, "groupBy": "NONE", "page": 0, "size": 500}
-                )
-                for ro in ros_page:
-                    ro["_board"] = board
-                all_ros.extend(ros_page)
-            except Exception as e:
-                audit_results["endpoint_trust"][f"job-board-{board}"] = f"ERROR: {str(e)}"
-
-        # Deduplicate by RO ID
-        seen_ids = set()
-        unique_ros = []
-        for ro in all_ros:
-            ro_id = ro.get("id")
-            if ro_id and ro_id not in seen_ids:
-                seen_ids.add(ro_id)
-                unique_ros.append(ro)
+        if boards is None:
+            boards = await fetch_audit_ros(tm, shop_id)
+        unique_ros, board_errors = boards
+        audit_results["endpoint_trust"].update(board_errors)
 
         # Filter to ROs with activity on audit date
-        # Check: createdDate, updatedDate, postedDate, or job authorizedDate
-        ros_for_date = []
-        for ro in unique_ros:
-            # Check various date fields
-            dates_to_check = [
-                ro.get("createdDate"),
-                ro.get("updatedDate"),
-                ro.get("postedDate")
-            ]
-
-            for date_str in dates_to_check:
-                if date_str:
-                    try:
-                        ro_date = datetime.fromisoformat(date_str.replace("Z", "+00:00")).date()
-                        if ro_date == audit_date:
-                            ros_for_date.append(ro)
-                            break
-                    except:
-                        pass
-
-        # Audit each RO
-        for ro in ros_for_date:
-            ro_audit = await audit_single_ro(tm, ro, audit_date)
-            audit_results["ros"].append(ro_audit)
+        audit_date_iso = audit_date.isoformat()
+        ros_for_date = [ro for ro in unique_ros if audit_date_iso in ro["_activity_days"]]
+
+        # Audit ROs concurrently (bounded) and tally each one as it finishes;
+        # records are slotted back by index so the list keeps board order
+        semaphore = ro_semaphore or asyncio.Semaphore(MAX_CONCURRENT_RO_AUDITS)
+
+        async def _audit(index: int, ro: dict) -> tuple:
+            # One RO failing unexpectedly shouldn't sink the whole day
+            try:
+                async with semaphore:
+                    return index, await audit_single_ro(tm, ro, audit_date, cache=ro_cache)
+            except Exception as e:
+                print(f"[Audit] Error auditing RO {ro.get('id')}: {e}")
+                audit_results["endpoint_trust"][f"audit-ro-{ro.get('id')}"] = f"ERROR: {str(e)}"
+                return index, None
+
+        ro_audits: List[Optional[dict]] = [None] * len(ros_for_date)
+        summary = audit_results["summary"]
+
+        for next_done in asyncio.as_completed([_audit(i, ro) for i, ro in enumerate(ros_for_date)]):
+            index, ro_audit = await next_done
+            if ro_audit is None:
+                continue
+            ro_audits[index] = ro_audit
             audit_results["ros_audited"] += 1
+            for source in ro_audit["source_errors"]:
+                error = ro_audit["data_sources"][source]["error"]
+                audit_results["endpoint_trust"][f"{source}-ro-{ro_audit['ro_id']}"] = f"ERROR: {error}"
 
             # Count discrepancies
             if ro_audit.get("discrepancies"):
                 audit_results["discrepancies_found"] += len(ro_audit["discrepancies"])
                 for disc in ro_audit["discrepancies"]:
                     disc_type = disc.get("type", "unknown")
-                    if disc_type in audit_results["summary"]:
-                        audit_results["summary"][disc_type] += 1
-                    audit_results["summary"]["total_issues"] += 1
+                    if disc_type in summary:
+                        summary[disc_type] += 1
+                    summary["total_issues"] += 1
+
+        audit_results["ros"].extend(ro_audit for ro_audit in ro_audits if ro_audit is not None)
+
+        # Don't cache a partial audit (a job board, RO audit or RO source failed)
+        if is_past_day and not audit_results["endpoint_trust"]:
+            _daily_cache.set(day_key, audit_results, COMPLETED_DAY_TTL_SECONDS)
 
         return audit_results
 
@@ -131,10 +302,20 @@ async def audit_daily_ros(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def audit_single_ro(tm, ro_summary: dict, audit_date) -> dict:
+async def audit_single_ro(tm, ro_summary: dict, audit_date, cache: Optional[dict] = None) -> dict:
     """
     Audit a single RO by fetching from multiple endpoints and comparing.
+
+    With a cache (ro_id -> task), concurrent and repeated audits of the
+    same RO share one set of TM fetches. Sources that failed are listed in
+    "source_errors" (their data_sources entry holds the error).
     """
+    if cache is not None:
+        ro_id = ro_summary.get("id")
+        if ro_id not in cache:
+            cache[ro_id] = asyncio.ensure_future(audit_single_ro(tm, ro_summary, audit_date))
+        return await cache[ro_id]
+
     ro_id = ro_summary.get("id")
     ro_number = ro_summary.get("roNumber") or ro_summary.get("repairOrderNumber")
 
@@ -144,6 +325,7 @@ async def audit_single_ro(tm, ro_summary: dict, audit_date) -> dict:
         "board": ro_summary.get("_board"),
         "discrepancies": [],
         "data_sources": {},
+        "source_errors": [],
         "calculated_values": {},
         "comparison": {}
     }
@@ -159,9 +341,17 @@ async def audit_single_ro(tm, ro_summary: dict, audit_date) -> dict:
         "updated_date": ro_summary.get("updatedDate")
     }
 
+    # Sources 2-4 are independent; fetch them together
+    estimate, profit_labor, ro_basic = await fetch_ro_sources(tm, ro_id)
+
+    # (parts, labor) line-item revenue in cents, kept for the profit/labor
+    # cross-check; None if the estimate couldn't be audited
+    line_item_cents = None
+
     # Source 2: Full Estimate
     try:
-        estimate = await tm.get(f"/api/repair-order/{ro_id}/estimate")
+        if isinstance(estimate, Exception):
+            raise estimate
         audit_record["data_sources"]["estimate"] = {
             "raw_total": estimate.get("total"),
             "raw_subtotal": estimate.get("subtotal"),
@@ -198,6 +388,7 @@ async def audit_single_ro(tm, ro_summary: dict, audit_date) -> dict:
             total_labor_cost += job_audit["labor_cost_calc"]
 
         audit_record["jobs"] = jobs_audit
+        line_item_cents = (total_parts_calc, total_labor_calc)
 
         # Calculate totals from line items
         subtotal_calc = total_parts_calc + total_labor_calc + total_fees_calc - total_discount_calc
@@ -228,8 +419,8 @@ async def audit_single_ro(tm, ro_summary: dict, audit_date) -> dict:
         comparison_value = estimate_subtotal if estimate_subtotal else estimate_total
         comparison_field = "subtotal" if estimate_subtotal else "total"
 
-        audit_record["comparison"]["subtotal"] = {
-            "calculated": cents_to_dollars(subtotal_calc),
+        subtotal_comparison = {
+            "calculated": audit_record["calculated_values"]["subtotal"],
             "estimate_subtotal": cents_to_dollars(estimate_subtotal),
             "estimate_total": cents_to_dollars(estimate_total),
             "estimate_authorized": cents_to_dollars(estimate_authorized),
@@ -237,20 +428,22 @@ async def audit_single_ro(tm, ro_summary: dict, audit_date) -> dict:
             "difference": cents_to_dollars(subtotal_calc - comparison_value),
             "match": abs(subtotal_calc - comparison_value) < 100  # Within $1
         }
+        audit_record["comparison"]["subtotal"] = subtotal_comparison
 
         # Only flag discrepancy if we have a valid comparison and it doesn't match
-        if comparison_value > 0 and not audit_record["comparison"]["subtotal"]["match"]:
+        if comparison_value > 0 and not subtotal_comparison["match"]:
             audit_record["discrepancies"].append({
                 "type": "sum_mismatches",
                 "field": comparison_field,
-                "calculated": cents_to_dollars(subtotal_calc),
-                "reported": cents_to_dollars(comparison_value),
-                "difference": cents_to_dollars(subtotal_calc - comparison_value),
+                "calculated": subtotal_comparison["calculated"],
+                "reported": subtotal_comparison[f"estimate_{comparison_field}"],
+                "difference": subtotal_comparison["difference"],
                 "suspected_cause": f"Line item sum doesn't match estimate {comparison_field}"
             })
 
     except Exception as e:
         audit_record["data_sources"]["estimate"] = {"error": str(e)}
+        audit_record["source_errors"].append("estimate")
 
     # Source 3: Profit/Labor endpoint
     # NOTE: API uses camelCase and returns nested objects:
@@ -258,7 +451,8 @@ async def audit_single_ro(tm, ro_summary: dict, audit_date) -> dict:
     # - totalProfit: { retail, cost, profit, margin }
     # - partsProfit is NOT returned - calculate as (total - labor)
     try:
-        profit_labor = await tm.get(f"/api/repair-order/{ro_id}/profit/labor")
+        if isinstance(profit_labor, Exception):
+            raise profit_labor
 
         # Extract from nested structure (camelCase keys!)
         labor_obj = profit_labor.get("laborProfit", {}) or {}
@@ -287,12 +481,11 @@ async def audit_single_ro(tm, ro_summary: dict, audit_date) -> dict:
             "total_margin": total_obj.get("margin")
         }
 
-        # Compare profit/labor values with our calculations
-        if "calculated_values" in audit_record:
-            calc = audit_record["calculated_values"]
+        # Compare profit/labor values with our calculations (in cents)
+        if line_item_cents is not None:
+            parts_rev_calc, labor_rev_calc = line_item_cents
 
             # Check labor revenue
-            labor_rev_calc = int(calc["labor_total"] * 100)
             if abs(labor_revenue - labor_rev_calc) > 100:
                 audit_record["discrepancies"].append({
                     "type": "cross_endpoint_disagreements",
@@ -304,7 +497,6 @@ async def audit_single_ro(tm, ro_summary: dict, audit_date) -> dict:
                 })
 
             # Check parts revenue (implied from total - labor)
-            parts_rev_calc = int(calc["parts_total"] * 100)
             if abs(parts_revenue_implied - parts_rev_calc) > 100:
                 audit_record["discrepancies"].append({
                     "type": "cross_endpoint_disagreements",
@@ -317,18 +509,25 @@ async def audit_single_ro(tm, ro_summary: dict, audit_date) -> dict:
 
     except Exception as e:
         audit_record["data_sources"]["profit_labor"] = {"error": str(e)}
+        audit_record["source_errors"].append("profit_labor")
 
     # Source 4: Basic RO endpoint
     try:
-        ro_basic = await tm.get(f"/api/repair-order/{ro_id}")
+        if isinstance(ro_basic, Exception):
+            raise ro_basic
+        advisor = ro_basic.get("serviceAdvisor")
+        if not isinstance(advisor, dict):
+            advisor = {}
+        advisor_id = advisor.get("id")
         audit_record["data_sources"]["ro_basic"] = {
             "status": ro_basic.get("status"),
-            "advisor_id": safe_get(ro_basic, "serviceAdvisor", "id"),
-            "advisor_name": f"{safe_get(ro_basic, 'serviceAdvisor', 'firstName', default='')} {safe_get(ro_basic, 'serviceAdvisor', 'lastName', default='')}".strip()
+            "advisor_id": advisor_id if advisor_id is not None else 0,
+            "advisor_name": f"{advisor.get('firstName') or ''} {advisor.get('lastName') or ''}".strip()
         }
         audit_record["advisor"] = audit_record["data_sources"]["ro_basic"]["advisor_name"] or "Unassigned"
     except Exception as e:
         audit_record["data_sources"]["ro_basic"] = {"error": str(e)}
+        audit_record["source_errors"].append("ro_basic")
 
     return audit_record
 
@@ -355,6 +554,17 @@ def audit_job(job: dict, discrepancies: list) -> dict:
         "labor_issues": []
     }
 
+    # Bind hot lookups once; the loops below run per line item
+    c2d = cents_to_dollars
+    job_name = job.get("name")
+    disc_append = discrepancies.append
+    parts_append = job_audit["parts"].append
+    parts_issues_append = job_audit["parts_issues"].append
+    labor_append = job_audit["labor"].append
+    labor_issues_append = job_audit["labor_issues"].append
+    parts_total_calc = parts_cost_calc = 0
+    labor_total_calc = labor_cost_calc = 0
+
     # Audit parts
     for part in job.get("parts", []):
         part_id = part.get("id")
@@ -371,31 +581,35 @@ def audit_job(job: dict, discrepancies: list) -> dict:
             "id": part_id,
             "name": part_name,
             "qty": qty,
-            "retail": cents_to_dollars(retail),
-            "cost": cents_to_dollars(cost),
-            "total_reported": cents_to_dollars(total_reported),
-            "total_calculated": cents_to_dollars(total_calc),
+            "retail": c2d(retail),
+            "cost": c2d(cost),
+            "total_reported": c2d(total_reported),
+            "total_calculated": c2d(total_calc),
             "match": abs(total_calc - total_reported) < 10  # Within 10 cents
         }
-        job_audit["parts"].append(part_record)
+        parts_append(part_record)
 
-        job_audit["parts_total_calc"] += total_calc
-        job_audit["parts_cost_calc"] += qty * cost
+        parts_total_calc += total_calc
+        parts_cost_calc += qty * cost
 
         # Check for math error
         if not part_record["match"]:
+            # Reuse the dollar amounts already on part_record for the message
+            retail_usd = part_record["retail"]
+            expected_usd = part_record["total_calculated"]
+            reported_usd = part_record["total_reported"]
             issue = {
                 "type": "parts_math_errors",
-                "job": job.get("name"),
+                "job": job_name,
                 "part": part_name,
                 "qty": qty,
-                "retail": cents_to_dollars(retail),
-                "expected": cents_to_dollars(total_calc),
-                "reported": cents_to_dollars(total_reported),
-                "suspected_cause": f"qty({qty}) × retail(${retail/100:.2f}) = ${total_calc/100:.2f}, but reported ${total_reported/100:.2f}"
+                "retail": retail_usd,
+                "expected": expected_usd,
+                "reported": reported_usd,
+                "suspected_cause": f"qty({qty}) × retail(${retail_usd:.2f}) = ${expected_usd:.2f}, but reported ${reported_usd:.2f}"
             }
-            job_audit["parts_issues"].append(issue)
-            discrepancies.append(issue)
+            parts_issues_append(issue)
+            disc_append(issue)
 
     # Audit labor
     for labor in job.get("labor", []):
@@ -415,44 +629,52 @@ def audit_job(job: dict, discrepancies: list) -> dict:
             "id": labor_id,
             "name": labor_name,
             "hours": hours,
-            "rate": cents_to_dollars(rate),
-            "total_reported": cents_to_dollars(total_reported),
-            "total_calculated": cents_to_dollars(total_calc),
+            "rate": c2d(rate),
+            "total_reported": c2d(total_reported),
+            "total_calculated": c2d(total_calc),
             "tech_id": tech_id,
             "tech_name": tech_name or "Unassigned",
             "match": abs(total_calc - total_reported) < 10
         }
-        job_audit["labor"].append(labor_record)
+        labor_append(labor_record)
 
-        job_audit["labor_total_calc"] += total_calc
+        labor_total_calc += total_calc
 
         # Estimate labor cost (if tech assigned, use their rate; otherwise flag)
         if tech_id:
             # We'd need tech rate here - for now estimate at $25/hr
-            job_audit["labor_cost_calc"] += int(hours * 2500)
+            labor_cost_calc += int(hours * 2500)
         else:
-            job_audit["labor_cost_calc"] += int(hours * 2500)  # Default
-            discrepancies.append({
+            labor_cost_calc += int(hours * 2500)  # Default
+            disc_append({
                 "type": "missing_data",
-                "job": job.get("name"),
+                "job": job_name,
                 "field": "technician",
                 "labor_line": labor_name,
                 "suspected_cause": "No technician assigned to labor line"
             })
 
         if not labor_record["match"]:
+            rate_usd = labor_record["rate"]
+            expected_usd = labor_record["total_calculated"]
+            reported_usd = labor_record["total_reported"]
             issue = {
                 "type": "labor_math_errors",
-                "job": job.get("name"),
+                "job": job_name,
                 "labor": labor_name,
                 "hours": hours,
-                "rate": cents_to_dollars(rate),
-                "expected": cents_to_dollars(total_calc),
-                "reported": cents_to_dollars(total_reported),
-                "suspected_cause": f"hours({hours}) × rate(${rate/100:.2f}) = ${total_calc/100:.2f}, but reported ${total_reported/100:.2f}"
+                "rate": rate_usd,
+                "expected": expected_usd,
+                "reported": reported_usd,
+                "suspected_cause": f"hours({hours}) × rate(${rate_usd:.2f}) = ${expected_usd:.2f}, but reported ${reported_usd:.2f}"
             }
-            job_audit["labor_issues"].append(issue)
-            discrepancies.append(issue)
+            labor_issues_append(issue)
+            disc_append(issue)
+
+    job_audit["parts_total_calc"] = parts_total_calc
+    job_audit["parts_cost_calc"] = parts_cost_calc
+    job_audit["labor_total_calc"] = labor_total_calc
+    job_audit["labor_cost_calc"] = labor_cost_calc
 
     # Audit fees
     for fee in job.get("fees", []):
@@ -466,6 +688,15 @@ def audit_job(job: dict, discrepancies: list) -> dict:
     return job_audit
 
 
+@router.post("/cache/clear")
+async def clear_audit_cache():
+    """
+    Drop cached past-day audits so the next request re-audits from TM.
+    """
+    _daily_cache.clear()
+    return {"cleared": True}
+
+
 @router.get("/ro/{ro_id}")
 async def audit_single_ro_by_id(ro_id: int):
     """
@@ -479,7 +710,7 @@ async def audit_single_ro_by_id(ro_id: int):
 
     try:
         audit_record = await audit_single_ro(tm, ro_summary, datetime.now().date())
-        return audit_record
+        return ORJSONResponse(audit_record)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -487,19 +718,24 @@ async def audit_single_ro_by_id(ro_id: int):
 @router.get("/date-range")
 async def audit_date_range(
     start: str = Query(..., description="Start date (YYYY-MM-DD)"),
-    end: str = Query(..., description="End date (YYYY-MM-DD)")
+    end: str = Query(..., description="End date (YYYY-MM-DD)"),
+    stream: bool = Query(False, description="Stream as NDJSON, one line per day as each finishes")
 ):
     """
     Audit all ROs in a date range, day by day.
     Returns summary of discrepancies across all days.
+
+    With stream=true the response is NDJSON: a header line (start_date,
+    end_date, days), one daily summary per line in completion order, then
+    a final line with the range totals.
     """
+    start_date = parse_audit_date(start)
+    end_date = parse_audit_date(end)
+
     tm = get_tm_client()
     await tm._ensure_token()
     shop_id = tm.get_shop_id()
 
-    start_date = datetime.fromisoformat(start).date()
-    end_date = datetime.fromisoformat(end).date()
-
     range_results = {
         "start_date": start,
         "end_date": end,
@@ -511,25 +747,56 @@ async def audit_date_range(
         "endpoint_reliability": {}
     }
 
-    current_date = end_date
-    while current_date >= start_date:
-        # Audit this day
-        day_result = await audit_daily_ros(date=current_date.isoformat())
-
+    # Audit days concurrently (bounded), newest first. The job boards are
+    # fetched once (unless every day is cached) and filtered per day in
+    # memory; ROs active on several days share one audit via ro_cache.
+    audit_dates = [end_date - timedelta(days=n) for n in range((end_date - start_date).days + 1)]
+    boards = None
+    if any(cached_day_audit(day) is None for day in audit_dates):
+        boards = await fetch_audit_ros(tm, shop_id)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_AUDIT_DAYS)
+    # One RO limit for the whole range, not MAX_CONCURRENT_RO_AUDITS per day
+    ro_semaphore = asyncio.Semaphore(MAX_CONCURRENT_RO_AUDITS)
+    ro_cache: Dict[Any, asyncio.Future] = {}
+
+    async def _audit_day(day) -> tuple:
+        async with semaphore:
+            return day, await run_daily_audit(tm, shop_id, day, ro_cache, boards, ro_semaphore)
+
+    def _add_day(day, day_result: dict) -> dict:
         range_results["days_audited"] += 1
         range_results["total_ros"] += day_result["ros_audited"]
         range_results["total_discrepancies"] += day_result["discrepancies_found"]
-
-        range_results["daily_summaries"].append({
-            "date": current_date.isoformat(),
+        return {
+            "date": day.isoformat(),
             "ros_audited": day_result["ros_audited"],
             "discrepancies": day_result["discrepancies_found"],
             "summary": day_result["summary"]
-        })
+        }
 
-        current_date -= timedelta(days=1)
+    if stream:
+        async def _stream_days():
+            tasks = [asyncio.ensure_future(_audit_day(day)) for day in audit_dates]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    day, day_result = await next_done
+                    yield _add_day(day, day_result)
+            finally:
+                # Client went away or a day failed; stop the remaining audits
+                for task in tasks:
+                    task.cancel()
+            yield {
+                key: value for key, value in range_results.items()
+                if key not in ("start_date", "end_date", "daily_summaries")
+            }
+
+        header = {"start_date": start, "end_date": end, "days": len(audit_dates)}
+        return ndjson_response(header, _stream_days())
+
+    day_results = await asyncio.gather(*(_audit_day(day) for day in audit_dates))
+    range_results["daily_summaries"] = [_add_day(day, day_result) for day, day_result in day_results]
 
-    return range_results
+    return ORJSONResponse(range_results)
 
 
 @router.get("/today")
@@ -605,102 +872,98 @@ async def audit_today_ros(
         }
     }
 
-    # Fetch all ROs from all boards
-    all_ros = []
+    # Fetch all ROs from all boards, keeping the first board an RO appears on,
+    # and filter to ROs with activity on target date in the same pass
+    target_iso = target_date.isoformat()
     seen_ids = set()
+    active_ros = []
 
-    for board in ["ACTIVE", "POSTED", "COMPLETE"]:
+    for board, ros_page in zip(JOB_BOARDS, await fetch_job_boards(tm, shop_id)):
+        if isinstance(ros_page, Exception):
+            print(f"[Audit] Error fetching {board} board: {ros_page}")
+            continue
+        for ro in ros_page:
+            ro_id = ro.get("id")
+            if not ro_id or ro_id in seen_ids:
+                continue
+            seen_ids.add(ro_id)
+            if target_iso in activity_days(ro):
+                ro["_board"] = board
+                active_ros.append(ro)
+
+    # Build detailed RO records concurrently (bounded), keeping board order
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_RO_AUDITS)
+
+    async def _build(ro_summary: dict) -> Optional[dict]:
+        # A failed RO is logged and left out rather than failing the whole day
         try:
-            ros_page = await tm.get(
-                f"/api/shop/{shop_id}/job-board-group-by",
-                {"board": board, "groupBy": "NONE", "page": 0, "size": 500}
-            )
-            for ro in ros_page:
-                ro_id = ro.get("id")
-                if ro_id and ro_id not in seen_ids:
-                    seen_ids.add(ro_id)
-                    ro["_board"] = board
-                    all_ros.append(ro)
+            async with semaphore:
+                return await build_ro_audit_record(tm, ro_summary.get("id"), ro_summary, target_date)
         except Exception as e:
-            print(f"[Audit] Error fetching {board} board: {e}")
-
-    # Filter to ROs with activity on target date
-    # Check updatedDate, postedDate, or job authorizedDate
-    for ro_summary in all_ros:
-        ro_id = ro_summary.get("id")
-
-        # Check if RO has activity on target date
-        has_activity = False
-        dates_to_check = [
-            ro_summary.get("updatedDate"),
-            ro_summary.get("postedDate"),
-            ro_summary.get("createdDate")
-        ]
-
-        for date_str in dates_to_check:
-            if date_str:
-                try:
-                    ro_date = datetime.fromisoformat(date_str.replace("Z", "+00:00")).date()
-                    if ro_date == target_date:
-                        has_activity = True
-                        break
-                except:
-                    pass
-
-        if not has_activity:
-            continue
-
-        # Build detailed RO record
-        ro_record = await build_ro_audit_record(tm, ro_id, ro_summary, target_date)
-
+            print(f"[Audit] Error building audit record for RO {ro_summary.get('id')}: {e}")
+            return None
+
+    ro_records = await asyncio.gather(*(_build(ro_summary) for ro_summary in active_ros))
+
+    # Aggregate in a single pass, with the nested totals bound once
+    pot_totals = result["totals"]["potential"]
+    auth_totals = result["totals"]["authorized"]
+    pending_totals = result["totals"]["pending"]
+    issues = result["issues"]
+    issues_by_type = issues["by_type"]
+    ros_append = result["ros"].append
+    # profit_labor revenue is the GP% denominator (source of truth), since
+    # profit comes from the profit/labor endpoint, not our calculated revenue
+    total_pl_revenue = 0
+
+    for ro_record in ro_records:
         if ro_record:
-            result["ros"].append(ro_record)
+            ros_append(ro_record)
 
             # Aggregate totals
             pot = ro_record["potential"]
             auth = ro_record["authorized"]
 
-            result["totals"]["potential"]["revenue"] += pot["revenue"]
-            result["totals"]["potential"]["parts"] += pot["parts"]
-            result["totals"]["potential"]["labor"] += pot["labor"]
-            result["totals"]["potential"]["fees"] += pot["fees"]
-            result["totals"]["potential"]["discount"] += pot["discount"]
-            result["totals"]["potential"]["job_count"] += pot["job_count"]
-            result["totals"]["potential"]["ro_count"] += 1
-
-            result["totals"]["authorized"]["revenue"] += auth["revenue"]
-            result["totals"]["authorized"]["parts"] += auth["parts"]
-            result["totals"]["authorized"]["labor"] += auth["labor"]
-            result["totals"]["authorized"]["profit"] += auth["profit"]
-            result["totals"]["authorized"]["job_count"] += auth["job_count"]
+            pot_totals["revenue"] += pot["revenue"]
+            pot_totals["parts"] += pot["parts"]
+            pot_totals["labor"] += pot["labor"]
+            pot_totals["fees"] += pot["fees"]
+            pot_totals["discount"] += pot["discount"]
+            pot_totals["job_count"] += pot["job_count"]
+            pot_totals["ro_count"] += 1
+
+            auth_totals["revenue"] += auth["revenue"]
+            auth_totals["parts"] += auth["parts"]
+            auth_totals["labor"] += auth["labor"]
+            auth_totals["profit"] += auth["profit"]
+            auth_totals["job_count"] += auth["job_count"]
             if auth["revenue"] > 0:
-                result["totals"]["authorized"]["ro_count"] += 1
+                auth_totals["ro_count"] += 1
+
+            pending_totals["revenue"] += pot["revenue"] - auth["revenue"]
+            pending_totals["job_count"] += pot["job_count"] - auth["job_count"]
 
-            result["totals"]["pending"]["revenue"] += pot["revenue"] - auth["revenue"]
-            result["totals"]["pending"]["job_count"] += pot["job_count"] - auth["job_count"]
+            total_pl_revenue += ro_record["endpoints"]["profit_labor_total"]
 
             # Count issues
             if ro_record["issues"]:
-                result["issues"]["ros_with_issues"] += 1
-                result["issues"]["total"] += len(ro_record["issues"])
+                issues["ros_with_issues"] += 1
+                issues["total"] += len(ro_record["issues"])
                 for issue in ro_record["issues"]:
                     issue_type = issue.get("type", "other")
-                    if issue_type in result["issues"]["by_type"]:
-                        result["issues"]["by_type"][issue_type] += 1
+                    if issue_type in issues_by_type:
+                        issues_by_type[issue_type] += 1
 
-# Calculate aggregate GP% using profit_labor revenue (source of truth)
-    # We cannot use our calculated revenue because profit comes from profit/labor endpoint
-    total_pl_revenue = sum(ro["endpoints"]["profit_labor_total"] for ro in result["ros"])
-    total_auth_profit = result["totals"]["authorized"]["profit"]
+    # Calculate aggregate GP% using profit_labor revenue
     if total_pl_revenue > 0:
-        result["totals"]["authorized"]["gp_percent"] = round(
-            (total_auth_profit / total_pl_revenue) * 100, 2
+        auth_totals["gp_percent"] = round(
+            (auth_totals["profit"] / total_pl_revenue) * 100, 2
         )
 
     # Sort ROs by authorized revenue descending
     result["ros"].sort(key=lambda x: x["authorized"]["revenue"], reverse=True)
 
-    return result
+    return ORJSONResponse(result)
 
 
 async def build_ro_audit_record(tm, ro_id: int, ro_summary: dict, target_date) -> Optional[dict]:
@@ -753,15 +1016,21 @@ async def build_ro_audit_record(tm, ro_id: int, ro_summary: dict, target_date) -
         "issues": []
     }
 
-    # Fetch estimate
+    # Fetch estimate and profit/labor together. The basic RO endpoint is only
+    # needed for the advisor, which the estimate usually carries already.
+    estimate, profit_labor, _ = await fetch_ro_sources(tm, ro_id, include_basic=False)
+
     try:
-        estimate = await tm.get(f"/api/repair-order/{ro_id}/estimate")
+        if isinstance(estimate, Exception):
+            raise estimate
 
-        # Extract customer/vehicle
+        # Extract customer/vehicle/advisor
         customer = estimate.get("customer", {}) or {}
         vehicle = estimate.get("vehicle", {}) or {}
+        service_writer = estimate.get("serviceWriter", {}) or {}
         record["customer"] = f"{customer.get('firstName', '')} {customer.get('lastName', '')}".strip() or "Unknown"
         record["vehicle"] = f"{vehicle.get('year', '')} {vehicle.get('make', '')} {vehicle.get('model', '')}".strip() or "N/A"
+        record["advisor"] = f"{service_writer.get('firstName', '')} {service_writer.get('lastName', '')}".strip() or "Unassigned"
 
         # Store raw endpoint values
         record["endpoints"]["estimate_total"] = cents_to_dollars(estimate.get("total") or 0)
@@ -774,7 +1043,13 @@ async def build_ro_audit_record(tm, ro_id: int, ro_summary: dict, target_date) -
                 "message": "estimate.subtotal is null - using total instead"
             })
 
-        # Process each job
+        # Process each job. Money is summed in integer cents and converted
+        # to dollars once per RO, so totals carry no float drift.
+        potential = record["potential"]
+        authorized = record["authorized"]
+        potential_cents = dict.fromkeys(("revenue", "parts", "labor", "fees", "discount"), 0)
+        authorized_cents = dict.fromkeys(("revenue", "parts", "labor"), 0)
+        target_iso = target_date.isoformat()
         for job in estimate.get("jobs", []):
             job_id = job.get("id")
             job_name = job.get("name", "Unnamed Job")
@@ -783,13 +1058,13 @@ async def build_ro_audit_record(tm, ro_id: int, ro_summary: dict, target_date) -
 
             # Calculate job totals
             parts_total = sum(p.get("total", 0) for p in job.get("parts", []))
-            labor_total = sum(l.get("total", 0) for l in job.get("labor", []))
             fees_total = sum(f.get("total", 0) for f in job.get("fees", []))
             discount = job.get("discount", 0) or 0
-            job_total = parts_total + labor_total + fees_total - discount
 
-            # Check for missing technician
+            # Sum labor and check for missing technician in one pass
+            labor_total = 0
             for labor in job.get("labor", []):
+                labor_total += labor.get("total", 0)
                 tech = labor.get("technician")
                 if not tech or not tech.get("id"):
                     record["issues"].append({
@@ -797,6 +1072,8 @@ async def build_ro_audit_record(tm, ro_id: int, ro_summary: dict, target_date) -
                         "message": f"No technician assigned: {job_name} - {labor.get('name', 'labor')}"
                     })
 
+            job_total = parts_total + labor_total + fees_total - discount
+
             job_summary = {
                 "job_id": job_id,
                 "name": job_name,
@@ -810,34 +1087,33 @@ async def build_ro_audit_record(tm, ro_id: int, ro_summary: dict, target_date) -
             }
 
             # Add to POTENTIAL (all jobs)
-            record["potential"]["revenue"] += cents_to_dollars(job_total)
-            record["potential"]["parts"] += cents_to_dollars(parts_total)
-            record["potential"]["labor"] += cents_to_dollars(labor_total)
-            record["potential"]["fees"] += cents_to_dollars(fees_total)
-            record["potential"]["discount"] += cents_to_dollars(discount)
-            record["potential"]["job_count"] += 1
-            record["potential"]["jobs"].append(job_summary)
+            potential_cents["revenue"] += job_total
+            potential_cents["parts"] += parts_total
+            potential_cents["labor"] += labor_total
+            potential_cents["fees"] += fees_total
+            potential_cents["discount"] += discount
+            potential["job_count"] += 1
+            potential["jobs"].append(job_summary)
 
             # Add to AUTHORIZED only if authorized
             if is_authorized:
-                # Check if authorized on target date
-                auth_on_target = False
-                if auth_date:
-                    try:
-                        auth_dt = datetime.fromisoformat(auth_date.replace("Z", "+00:00")).date()
-                        auth_on_target = (auth_dt == target_date)
-                    except:
-                        pass
-
-                record["authorized"]["revenue"] += cents_to_dollars(job_total)
-                record["authorized"]["parts"] += cents_to_dollars(parts_total)
-                record["authorized"]["labor"] += cents_to_dollars(labor_total)
-                record["authorized"]["job_count"] += 1
-                record["authorized"]["jobs"].append({
+                # Authorized on target date? (YYYY-MM-DD prefix, no parsing)
+                auth_on_target = isinstance(auth_date, str) and auth_date[:10] == target_iso
+
+                authorized_cents["revenue"] += job_total
+                authorized_cents["parts"] += parts_total
+                authorized_cents["labor"] += labor_total
+                authorized["job_count"] += 1
+                authorized["jobs"].append({
                     **job_summary,
                     "authorized_on_target_date": auth_on_target
                 })
 
+        for key, cents in potential_cents.items():
+            potential[key] = cents_to_dollars(cents)
+        for key, cents in authorized_cents.items():
+            authorized[key] = cents_to_dollars(cents)
+
     except Exception as e:
         record["issues"].append({
             "type": "estimate_error",
@@ -847,7 +1123,8 @@ async def build_ro_audit_record(tm, ro_id: int, ro_summary: dict, target_date) -
 
     # Fetch profit/labor for authorized GP
     try:
-        profit_labor = await tm.get(f"/api/repair-order/{ro_id}/profit/labor")
+        if isinstance(profit_labor, Exception):
+            raise profit_labor
 
         labor_obj = profit_labor.get("laborProfit", {}) or {}
         total_obj = profit_labor.get("totalProfit", {}) or {}
@@ -864,8 +1141,7 @@ async def build_ro_audit_record(tm, ro_id: int, ro_summary: dict, target_date) -
         record["authorized"]["gp_percent"] = round(pl_margin * 100, 2)
 
         # Check for mismatch between our authorized calculation and profit/labor
-        our_auth_rev = int(record["authorized"]["revenue"] * 100)
-        if abs(our_auth_rev - pl_revenue) > 100:  # More than $1 difference
+        if abs(authorized_cents["revenue"] - pl_revenue) > 100:  # More than $1 difference
             record["issues"].append({
                 "type": "profit_mismatch",
                 "message": f"Authorized revenue mismatch: calculated ${record['authorized']['revenue']:.2f} vs profit/labor ${pl_revenue/100:.2f}",
@@ -879,9 +1155,12 @@ async def build_ro_audit_record(tm, ro_id: int, ro_summary: dict, target_date) -
             "message": f"Failed to fetch profit/labor: {str(e)}"
         })
 
-    # Try to get advisor from basic RO endpoint
+    if record["advisor"] != "Unassigned":
+        return record
+
+    # Estimate had no service writer; try the basic RO endpoint
     try:
-        ro_basic = await tm.get(f"/api/repair-order/{ro_id}")
+        ro_basic = await get_coalesced(tm, f"/api/repair-order/{ro_id}")
         advisor = ro_basic.get("serviceAdvisor", {}) or {}
         record["advisor"] = f"{advisor.get('firstName', '')} {advisor.get('lastName', '')}".strip() or "Unassigned"
     except Exception as e:
@@ -403,7 +403,8 @@ async def get_true_metrics(
                 ro_gp = calculate_ro_true_gp(
                     estimate,
                     shop_config=shop_config,
-                    authorized_only=True
+                    authorized_only=True,
+                    include_line_items=include_details
                 )
 
                 if ro_gp.total_retail > 0:
@@ -603,7 +604,9 @@ async def compare_metrics(
                     continue
 
                 # Tier 2: Use ShopConfig
-                ro_gp = calculate_ro_true_gp(estimate, shop_config=shop_config, authorized_only=True)
+                ro_gp = calculate_ro_true_gp(
+                    estimate, shop_config=shop_config, authorized_only=True, include_line_items=False
+                )
                 if ro_gp.total_retail > 0:
                     ro_ids.add(ro["id"])
                     total_sales += ro_gp.total_retail
@@ -8,6 +8,7 @@ from fastapi import APIRouter, HTTPException, Query
 from typing import Optional, List
 from app.services.tm_client import get_tm_client
 from app.models.schemas import ShareEstimateRequest
+from app.models.enums import JOB_BOARD_VALUES
 
 router = APIRouter()
 
@@ -47,6 +48,9 @@ async def get_ro_list(
     - **group_by**: Grouping method
     - **search**: Optional search term
     """
+    if board not in JOB_BOARD_VALUES:
+        raise HTTPException(status_code=422, detail=f"Invalid board: {board}")
+
     tm = get_tm_client()
     await tm._ensure_token()
     shop_id = tm.get_shop_id()
@@ -16,10 +16,13 @@ All monetary values are in CENTS internally.
 """
 
 from typing import Dict, List, Optional, Tuple, Any
+from functools import lru_cache
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import asyncio
 
+from app.models.enums import FEE_NAME_PATTERN
+
 
 # Default fallback rate when no tech assigned and no shop average available
 DEFAULT_TECH_RATE_CENTS = 2500  # $25/hr in cents
@@ -53,16 +56,8 @@ def safe_float(value: Any, default: float = 0.0) -> float:
 
 def classify_fee(fee_name: str) -> str:
     """Classify fee by name into category"""
-    name_lower = fee_name.lower()
-    if "shop" in name_lower and "suppl" in name_lower:
-        return "shop_supplies"
-    elif "environ" in name_lower:
-        return "environmental"
-    elif "hazard" in name_lower or "haz" in name_lower:
-        return "hazardous_waste"
-    elif "dispos" in name_lower:
-        return "disposal"
-    return "other"
+    match = FEE_NAME_PATTERN.match(fee_name)
+    return match.lastgroup if match else "other"
 
 
 # ============== Dataclasses ==============
@@ -172,7 +167,7 @@ class JobGP:
     sublet_detail: List[SubletProfit] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ROTrueGP:
     """RO-level true GP calculation result - Tier 2 enhanced"""
     ro_id: int
@@ -227,6 +222,14 @@ class ShopConfig:
     tech_names: Dict[int, str] = field(default_factory=dict)  # employee_id -> name
     tax_rate: float = DEFAULT_TAX_RATE
     cached_at: datetime = field(default_factory=datetime.now)
+    # employee_id -> (rate, name), built once so labor lines do a single lookup
+    tech_lookup: Dict[int, Tuple[int, Optional[str]]] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.tech_lookup = {
+            tech_id: (rate, self.tech_names.get(tech_id))
+            for tech_id, rate in self.tech_rates.items()
+        }
     
     def is_expired(self) -> bool:
         return (datetime.now() - self.cached_at).total_seconds() > CACHE_TTL_SECONDS
@@ -235,22 +238,42 @@ class ShopConfig:
 # ============== Cache ==============
 
 _shop_config_cache: Dict[str, ShopConfig] = {}
+_shop_config_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _get_cached_shop_config(shop_id: str) -> Optional[ShopConfig]:
+    """Return the cached config for a shop if present and not expired."""
+    cached = _shop_config_cache.get(shop_id)
+    if cached is not None and not cached.is_expired():
+        return cached
+    return None
 
 
 async def get_shop_config(tm_client, shop_id: str, force_refresh: bool = False) -> ShopConfig:
     """
     Tier 2: Get cached shop configuration.
     
-    Caches tech rates, shop info to reduce API calls.
+    Caches tech rates, shop info to reduce API calls. Concurrent misses for
+    the same shop share a single employees fetch.
     """
-    global _shop_config_cache
-    
     # Check cache
-    if not force_refresh and shop_id in _shop_config_cache:
-        cached = _shop_config_cache[shop_id]
-        if not cached.is_expired():
+    if not force_refresh:
+        cached = _get_cached_shop_config(shop_id)
+        if cached is not None:
             return cached
-    
+
+    lock = _shop_config_locks.setdefault(shop_id, asyncio.Lock())
+    async with lock:
+        # Another request may have refreshed the cache while we waited
+        if not force_refresh:
+            cached = _get_cached_shop_config(shop_id)
+            if cached is not None:
+                return cached
+        return await _fetch_shop_config(tm_client, shop_id)
+
+
+async def _fetch_shop_config(tm_client, shop_id: str) -> ShopConfig:
+    """Fetch shop configuration from TM and store it in the cache."""
     # Fetch fresh data
     try:
         employees = await tm_client.get(
@@ -384,9 +407,8 @@ def calculate_labor_cost(
             tech_rate = safe_int(technician.get('hourlyRate'), 0)
             tech_rate_source = 'assigned'
             tech_name = f"{technician.get('firstName', '')} {technician.get('lastName', '')}".strip()
-        elif shop_config and tech_id in shop_config.tech_rates:
-            tech_rate = shop_config.tech_rates[tech_id]
-            tech_name = shop_config.tech_names.get(tech_id)
+        elif shop_config and tech_id in shop_config.tech_lookup:
+            tech_rate, tech_name = shop_config.tech_lookup[tech_id]
             tech_rate_source = 'assigned'
     
     if tech_rate == 0:
@@ -540,9 +562,15 @@ def calculate_sublet_profit(sublet: dict) -> SubletProfit:
 
 def calculate_job_gp(
     job: dict,
-    shop_config: Optional[ShopConfig] = None
+    shop_config: Optional[ShopConfig] = None,
+    include_line_items: bool = True
 ) -> JobGP:
-    """Calculate GP for a single job including all line items."""
+    """
+    Calculate GP for a single job including all line items.
+
+    With include_line_items=False only the job totals are kept; the
+    per-part/labor/sublet detail lists are left empty.
+    """
     job_id = job.get('id', 0)
     job_name = job.get('name', 'Unknown Job')
     authorized = job.get('authorized', False)
@@ -554,7 +582,8 @@ def calculate_job_gp(
     parts_cost = 0
     for part in job.get('parts', []):
         pp = calculate_part_profit(part)
-        parts_detail.append(pp)
+        if include_line_items:
+            parts_detail.append(pp)
         parts_retail += pp.total_retail
         parts_cost += pp.total_cost
     parts_profit = parts_retail - parts_cost
@@ -565,7 +594,8 @@ def calculate_job_gp(
     labor_cost = 0
     for labor in job.get('labor', []):
         lp = calculate_labor_cost(labor, shop_config)
-        labor_detail.append(lp)
+        if include_line_items:
+            labor_detail.append(lp)
         labor_retail += lp.total_retail
         labor_cost += lp.total_cost
     labor_profit = labor_retail - labor_cost
@@ -576,7 +606,8 @@ def calculate_job_gp(
     sublet_cost = 0
     for sublet in job.get('sublets', []):
         sp = calculate_sublet_profit(sublet)
-        sublet_detail.append(sp)
+        if include_line_items:
+            sublet_detail.append(sp)
         sublet_retail += sp.retail
         sublet_cost += sp.cost
     sublet_profit = sublet_retail - sublet_cost
@@ -618,7 +649,8 @@ def calculate_ro_true_gp(
     estimate: dict,
     shop_config: Optional[ShopConfig] = None,
     shop_average_rate: Optional[int] = None,  # Legacy param
-    authorized_only: bool = True
+    authorized_only: bool = True,
+    include_line_items: bool = True
 ) -> ROTrueGP:
     """
     Calculate TRUE GP for an entire RO.
@@ -629,6 +661,9 @@ def calculate_ro_true_gp(
     - Fee breakdown with categorization
     - Tax attribution by category
     - Discount handling
+
+    Pass include_line_items=False when only RO/job totals are needed
+    (summary endpoints) to skip retaining per-line-item detail.
     """
     # Build shop config if only rate provided (legacy support)
     if shop_config is None and shop_average_rate:
@@ -667,14 +702,15 @@ def calculate_ro_true_gp(
     total_sublet_cost = 0
     job_discounts = 0
     authorized_count = 0
-    total_job_count = len(estimate.get('jobs', []))
+    jobs = estimate.get('jobs', [])
+    total_job_count = len(jobs)
 
-    for job in estimate.get('jobs', []):
-        job_gp = calculate_job_gp(job, shop_config)
-        
-        if authorized_only and not job_gp.authorized:
+    for job in jobs:
+        # Check authorization on the raw job so skipped jobs never get costed
+        if authorized_only and not job.get('authorized', False):
             continue
 
+        job_gp = calculate_job_gp(job, shop_config, include_line_items)
         job_results.append(job_gp)
         authorized_count += 1
 
@@ -811,17 +847,35 @@ def to_dollars_dict(obj) -> dict:
     return _convert_cents_to_dollars(d)
 
 
+_CENT_KEY_MARKERS = ('cost', 'retail', 'profit', 'amount', 'tax', 'discount', 'fee', 'due', 'subtotal', 'total')
+_RATE_KEYS = frozenset(('rate', 'tech_rate', 'avg_tech_rate'))
+
+# Key classification for _convert_cents_to_dollars
+_KEY_PLAIN = 0
+_KEY_CENTS = 1  # converted when the value is numeric
+_KEY_RATE = 2  # always converted
+
+
+@lru_cache(maxsize=512)
+def _classify_cents_key(k: str) -> int:
+    """Classify a field name once; dataclass field names repeat on every row."""
+    if any(x in k for x in _CENT_KEY_MARKERS) and 'pct' not in k and 'rate' not in k.lower() and 'count' not in k:
+        return _KEY_CENTS
+    if k in _RATE_KEYS:
+        return _KEY_RATE
+    if k == 'cap':
+        return _KEY_CENTS
+    return _KEY_PLAIN
+
+
 def _convert_cents_to_dollars(d: Any) -> Any:
     """Recursively convert cent fields to dollars."""
     if isinstance(d, dict):
         result = {}
         for k, v in d.items():
             # Fields that are in cents
-            if any(x in k for x in ['cost', 'retail', 'profit', 'amount', 'tax', 'discount', 'fee', 'due', 'subtotal', 'total']) and isinstance(v, (int, float)) and 'pct' not in k and 'rate' not in k.lower() and 'count' not in k:
-                result[k] = round(v / 100, 2)
-            elif k == 'rate' or k == 'tech_rate' or k == 'avg_tech_rate':
-                result[k] = round(v / 100, 2)
-            elif k == 'cap' and isinstance(v, (int, float)):
+            kind = _classify_cents_key(k) if isinstance(k, str) else _KEY_PLAIN
+            if kind == _KEY_RATE or (kind == _KEY_CENTS and isinstance(v, (int, float))):
                 result[k] = round(v / 100, 2)
             else:
                 result[k] = _convert_cents_to_dollars(v)
@@ -833,7 +887,7 @@ def _convert_cents_to_dollars(d: Any) -> Any:
 
 # ============== Tier 3: Analytics Dataclasses ==============
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TechPerformance:
     """Tier 3: Technician performance metrics"""
     tech_id: int
@@ -854,7 +908,7 @@ class TechPerformance:
     rate_source_counts: Dict[str, int] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class AdvisorPerformance:
     """Tier 3: Service advisor performance metrics"""
     advisor_id: int
@@ -877,7 +931,7 @@ class AdvisorPerformance:
     fee_sales: int = 0
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PartsMarginAnalysis:
     """Tier 3: Parts margin analysis"""
     total_parts_retail: int  # cents
@@ -895,7 +949,7 @@ class PartsMarginAnalysis:
     total_line_items: int = 0
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LaborEfficiency:
     """Tier 3: Labor efficiency metrics"""
     total_hours_billed: float
@@ -911,6 +965,8 @@ class LaborEfficiency:
     by_rate_source: Dict[str, Dict] = field(default_factory=dict)
     # Jobs
     total_labor_items: int = 0
+    # Efficiency
+    gp_per_hour: int = 0  # cents (labor profit per billed hour)
 
 
 @dataclass
@@ -940,214 +996,307 @@ class VarianceAnalysis:
     variance_reasons: List[str] = field(default_factory=list)
 
 
+@dataclass(frozen=True, slots=True)
+class FullAnalysis:
+    """Tier 3: RO totals plus tech/parts/labor aggregates from a single pass"""
+    total_sales: int  # cents
+    total_cost: int  # cents
+    total_gp: int  # cents
+    total_fee_profit: int  # cents
+    tech_performance: Dict[int, TechPerformance]
+    parts_margin: PartsMarginAnalysis
+    labor_efficiency: LaborEfficiency
+
+
 # ============== Tier 3: Analytics Functions ==============
 
+class _TechAccumulator:
+    """Running per-technician labor totals (see aggregate_tech_performance)."""
+
+    def __init__(self):
+        self.tech_data: Dict[int, Dict] = {}
+
+    def add(self, ro_id: int, labor: LaborProfit):
+        tech_id = labor.labor_id  # Using labor_id as placeholder
+        tech_name = labor.tech_name or "Unassigned"
+
+        # Get or create tech entry
+        if labor.tech_rate > 0:
+            # Try to identify tech from rate source
+            if labor.tech_rate_source == 'assigned' and labor.tech_name:
+                # Hash the name to get a consistent ID
+                tech_id = hash(labor.tech_name) % 100000
+                tech_name = labor.tech_name
+            else:
+                tech_id = 0
+                tech_name = f"Shop Average ({labor.tech_rate_source})"
+
+        if tech_id not in self.tech_data:
+            self.tech_data[tech_id] = {
+                'tech_id': tech_id,
+                'tech_name': tech_name,
+                'hourly_rate': labor.tech_rate,
+                'hours_billed': 0.0,
+                'labor_revenue': 0,
+                'labor_cost': 0,
+                'labor_profit': 0,
+                'jobs_worked': 0,
+                'ros_worked': set(),
+                'rate_source_counts': {}
+            }
+
+        td = self.tech_data[tech_id]
+        td['hours_billed'] += labor.hours
+        td['labor_revenue'] += labor.total_retail
+        td['labor_cost'] += labor.total_cost
+        td['labor_profit'] += labor.profit
+        td['jobs_worked'] += 1
+        td['ros_worked'].add(ro_id)
+        td['rate_source_counts'][labor.tech_rate_source] = \
+            td['rate_source_counts'].get(labor.tech_rate_source, 0) + 1
+
+    def result(self) -> Dict[int, TechPerformance]:
+        # Convert to TechPerformance objects
+        results = {}
+        for tech_id, td in self.tech_data.items():
+            margin_pct = (td['labor_profit'] / td['labor_revenue'] * 100) if td['labor_revenue'] > 0 else 0
+            gp_per_hour = int(td['labor_profit'] / td['hours_billed']) if td['hours_billed'] > 0 else 0
+
+            results[tech_id] = TechPerformance(
+                tech_id=tech_id,
+                tech_name=td['tech_name'],
+                hourly_rate=td['hourly_rate'],
+                hours_billed=round(td['hours_billed'], 2),
+                labor_revenue=td['labor_revenue'],
+                labor_cost=td['labor_cost'],
+                labor_profit=td['labor_profit'],
+                labor_margin_pct=round(margin_pct, 2),
+                jobs_worked=td['jobs_worked'],
+                ros_worked=len(td['ros_worked']),
+                gp_per_hour=gp_per_hour,
+                rate_source_counts=td['rate_source_counts']
+            )
+
+        return results
+
+
+class _PartsAccumulator:
+    """Running parts margin totals (see aggregate_parts_margin)."""
+
+    def __init__(self):
+        self.total_retail = 0
+        self.total_cost = 0
+        self.all_parts = []
+        self.single_qty_retail = 0
+        self.single_qty_cost = 0
+        self.single_qty_count = 0
+        self.multi_qty_retail = 0
+        self.multi_qty_cost = 0
+        self.multi_qty_count = 0
+
+    def add(self, part: PartProfit):
+        self.total_retail += part.total_retail
+        self.total_cost += part.total_cost
+
+        self.all_parts.append({
+            'name': part.name,
+            'quantity': part.quantity,
+            'cost': part.total_cost,
+            'retail': part.total_retail,
+            'profit': part.profit,
+            'margin_pct': part.margin_pct
+        })
+
+        if part.quantity == 1:
+            self.single_qty_retail += part.total_retail
+            self.single_qty_cost += part.total_cost
+            self.single_qty_count += 1
+        else:
+            self.multi_qty_retail += part.total_retail
+            self.multi_qty_cost += part.total_cost
+            self.multi_qty_count += 1
+
+    def result(self) -> PartsMarginAnalysis:
+        all_parts = self.all_parts
+        single_qty_retail, single_qty_cost = self.single_qty_retail, self.single_qty_cost
+        multi_qty_retail, multi_qty_cost = self.multi_qty_retail, self.multi_qty_cost
+
+        total_profit = self.total_retail - self.total_cost
+        overall_margin = (total_profit / self.total_retail * 100) if self.total_retail > 0 else 0
+
+        # Sort for high/low performers
+        sorted_parts = sorted(all_parts, key=lambda x: x['margin_pct'], reverse=True)
+        highest = sorted_parts[:5] if len(sorted_parts) >= 5 else sorted_parts
+        lowest = sorted_parts[-5:] if len(sorted_parts) >= 5 else []
+
+        avg_qty = sum(p['quantity'] for p in all_parts) / len(all_parts) if all_parts else 1.0
+
+        return PartsMarginAnalysis(
+            total_parts_retail=self.total_retail,
+            total_parts_cost=self.total_cost,
+            total_parts_profit=total_profit,
+            overall_margin_pct=round(overall_margin, 2),
+            single_items={
+                'count': self.single_qty_count,
+                'retail': single_qty_retail,
+                'cost': single_qty_cost,
+                'profit': single_qty_retail - single_qty_cost,
+                'margin_pct': round((single_qty_retail - single_qty_cost) / single_qty_retail * 100, 2) if single_qty_retail > 0 else 0
+            },
+            multi_items={
+                'count': self.multi_qty_count,
+                'retail': multi_qty_retail,
+                'cost': multi_qty_cost,
+                'profit': multi_qty_retail - multi_qty_cost,
+                'margin_pct': round((multi_qty_retail - multi_qty_cost) / multi_qty_retail * 100, 2) if multi_qty_retail > 0 else 0
+            },
+            highest_margin_parts=highest,
+            lowest_margin_parts=lowest,
+            avg_quantity=round(avg_qty, 2),
+            total_line_items=len(all_parts)
+        )
+
+
+class _LaborAccumulator:
+    """Running labor efficiency totals (see aggregate_labor_efficiency)."""
+
+    def __init__(self):
+        self.total_hours = 0.0
+        self.total_revenue = 0
+        self.total_cost = 0
+        self.total_items = 0
+
+        self.by_source: Dict[str, Dict] = {
+            'assigned': {'hours': 0, 'revenue': 0, 'cost': 0, 'count': 0},
+            'shop_average': {'hours': 0, 'revenue': 0, 'cost': 0, 'count': 0},
+            'default': {'hours': 0, 'revenue': 0, 'cost': 0, 'count': 0}
+        }
+
+        self.retail_rates = []
+        self.cost_rates = []
+
+    def add(self, labor: LaborProfit):
+        self.total_hours += labor.hours
+        self.total_revenue += labor.total_retail
+        self.total_cost += labor.total_cost
+        self.total_items += 1
+
+        self.retail_rates.append(labor.rate)
+        self.cost_rates.append(labor.tech_rate)
+
+        source = labor.tech_rate_source
+        if source in self.by_source:
+            self.by_source[source]['hours'] += labor.hours
+            self.by_source[source]['revenue'] += labor.total_retail
+            self.by_source[source]['cost'] += labor.total_cost
+            self.by_source[source]['count'] += 1
+
+    def result(self) -> LaborEfficiency:
+        retail_rates, cost_rates = self.retail_rates, self.cost_rates
+
+        total_profit = self.total_revenue - self.total_cost
+        overall_margin = (total_profit / self.total_revenue * 100) if self.total_revenue > 0 else 0
+
+        avg_retail = int(sum(retail_rates) / len(retail_rates)) if retail_rates else 0
+        avg_cost = int(sum(cost_rates) / len(cost_rates)) if cost_rates else 0
+
+        # Calculate margin for each source
+        for source, data in self.by_source.items():
+            if data['revenue'] > 0:
+                data['margin_pct'] = round((data['revenue'] - data['cost']) / data['revenue'] * 100, 2)
+            else:
+                data['margin_pct'] = 0
+
+        total_hours_billed = round(self.total_hours, 2)
+        gp_per_hour = int(total_profit / total_hours_billed) if total_hours_billed > 0 else 0
+
+        return LaborEfficiency(
+            total_hours_billed=total_hours_billed,
+            total_labor_revenue=self.total_revenue,
+            total_labor_cost=self.total_cost,
+            total_labor_profit=total_profit,
+            overall_margin_pct=round(overall_margin, 2),
+            avg_retail_rate=avg_retail,
+            avg_tech_cost_rate=avg_cost,
+            effective_spread=avg_retail - avg_cost,
+            by_rate_source=self.by_source,
+            total_labor_items=self.total_items,
+            gp_per_hour=gp_per_hour
+        )
+
+
 def aggregate_tech_performance(ro_results: List[ROTrueGP]) -> Dict[int, TechPerformance]:
     """
     Tier 3: Aggregate technician performance from RO calculations.
     Returns dict keyed by tech_id.
     """
-    tech_data: Dict[int, Dict] = {}
-
+    tech = _TechAccumulator()
     for ro in ro_results:
         for job in ro.jobs:
             for labor in job.labor_detail:
-                tech_id = labor.labor_id  # Using labor_id as placeholder
-                tech_name = labor.tech_name or "Unassigned"
-
-                # Get or create tech entry
-                if labor.tech_rate > 0:
-                    # Try to identify tech from rate source
-                    if labor.tech_rate_source == 'assigned' and labor.tech_name:
-                        # Hash the name to get a consistent ID
-                        tech_id = hash(labor.tech_name) % 100000
-                        tech_name = labor.tech_name
-                    else:
-                        tech_id = 0
-                        tech_name = f"Shop Average ({labor.tech_rate_source})"
-
-                if tech_id not in tech_data:
-                    tech_data[tech_id] = {
-                        'tech_id': tech_id,
-                        'tech_name': tech_name,
-                        'hourly_rate': labor.tech_rate,
-                        'hours_billed': 0.0,
-                        'labor_revenue': 0,
-                        'labor_cost': 0,
-                        'labor_profit': 0,
-                        'jobs_worked': 0,
-                        'ros_worked': set(),
-                        'rate_source_counts': {}
-                    }
-
-                td = tech_data[tech_id]
-                td['hours_billed'] += labor.hours
-                td['labor_revenue'] += labor.total_retail
-                td['labor_cost'] += labor.total_cost
-                td['labor_profit'] += labor.profit
-                td['jobs_worked'] += 1
-                td['ros_worked'].add(ro.ro_id)
-                td['rate_source_counts'][labor.tech_rate_source] = \
-                    td['rate_source_counts'].get(labor.tech_rate_source, 0) + 1
-
-    # Convert to TechPerformance objects
-    results = {}
-    for tech_id, td in tech_data.items():
-        margin_pct = (td['labor_profit'] / td['labor_revenue'] * 100) if td['labor_revenue'] > 0 else 0
-        gp_per_hour = int(td['labor_profit'] / td['hours_billed']) if td['hours_billed'] > 0 else 0
-
-        results[tech_id] = TechPerformance(
-            tech_id=tech_id,
-            tech_name=td['tech_name'],
-            hourly_rate=td['hourly_rate'],
-            hours_billed=round(td['hours_billed'], 2),
-            labor_revenue=td['labor_revenue'],
-            labor_cost=td['labor_cost'],
-            labor_profit=td['labor_profit'],
-            labor_margin_pct=round(margin_pct, 2),
-            jobs_worked=td['jobs_worked'],
-            ros_worked=len(td['ros_worked']),
-            gp_per_hour=gp_per_hour,
-            rate_source_counts=td['rate_source_counts']
-        )
-
-    return results
+                tech.add(ro.ro_id, labor)
+    return tech.result()
 
 
 def aggregate_parts_margin(ro_results: List[ROTrueGP]) -> PartsMarginAnalysis:
     """
     Tier 3: Analyze parts margins across all ROs.
     """
-    total_retail = 0
-    total_cost = 0
-    all_parts = []
-    single_qty_retail = 0
-    single_qty_cost = 0
-    single_qty_count = 0
-    multi_qty_retail = 0
-    multi_qty_cost = 0
-    multi_qty_count = 0
-
+    parts = _PartsAccumulator()
     for ro in ro_results:
         for job in ro.jobs:
             for part in job.parts_detail:
-                total_retail += part.total_retail
-                total_cost += part.total_cost
-
-                all_parts.append({
-                    'name': part.name,
-                    'quantity': part.quantity,
-                    'cost': part.total_cost,
-                    'retail': part.total_retail,
-                    'profit': part.profit,
-                    'margin_pct': part.margin_pct
-                })
-
-                if part.quantity == 1:
-                    single_qty_retail += part.total_retail
-                    single_qty_cost += part.total_cost
-                    single_qty_count += 1
-                else:
-                    multi_qty_retail += part.total_retail
-                    multi_qty_cost += part.total_cost
-                    multi_qty_count += 1
-
-    total_profit = total_retail - total_cost
-    overall_margin = (total_profit / total_retail * 100) if total_retail > 0 else 0
-
-    # Sort for high/low performers
-    sorted_parts = sorted(all_parts, key=lambda x: x['margin_pct'], reverse=True)
-    highest = sorted_parts[:5] if len(sorted_parts) >= 5 else sorted_parts
-    lowest = sorted_parts[-5:] if len(sorted_parts) >= 5 else []
-
-    avg_qty = sum(p['quantity'] for p in all_parts) / len(all_parts) if all_parts else 1.0
-
-    return PartsMarginAnalysis(
-        total_parts_retail=total_retail,
-        total_parts_cost=total_cost,
-        total_parts_profit=total_profit,
-        overall_margin_pct=round(overall_margin, 2),
-        single_items={
-            'count': single_qty_count,
-            'retail': single_qty_retail,
-            'cost': single_qty_cost,
-            'profit': single_qty_retail - single_qty_cost,
-            'margin_pct': round((single_qty_retail - single_qty_cost) / single_qty_retail * 100, 2) if single_qty_retail > 0 else 0
-        },
-        multi_items={
-            'count': multi_qty_count,
-            'retail': multi_qty_retail,
-            'cost': multi_qty_cost,
-            'profit': multi_qty_retail - multi_qty_cost,
-            'margin_pct': round((multi_qty_retail - multi_qty_cost) / multi_qty_retail * 100, 2) if multi_qty_retail > 0 else 0
-        },
-        highest_margin_parts=highest,
-        lowest_margin_parts=lowest,
-        avg_quantity=round(avg_qty, 2),
-        total_line_items=len(all_parts)
-    )
+                parts.add(part)
+    return parts.result()
 
 
 def aggregate_labor_efficiency(ro_results: List[ROTrueGP]) -> LaborEfficiency:
     """
     Tier 3: Analyze labor efficiency metrics.
     """
-    total_hours = 0.0
-    total_revenue = 0
-    total_cost = 0
-    total_items = 0
+    labor_acc = _LaborAccumulator()
+    for ro in ro_results:
+        for job in ro.jobs:
+            for labor in job.labor_detail:
+                labor_acc.add(labor)
+    return labor_acc.result()
+
 
-    by_source: Dict[str, Dict] = {
-        'assigned': {'hours': 0, 'revenue': 0, 'cost': 0, 'count': 0},
-        'shop_average': {'hours': 0, 'revenue': 0, 'cost': 0, 'count': 0},
-        'default': {'hours': 0, 'revenue': 0, 'cost': 0, 'count': 0}
-    }
+def aggregate_full_analysis(ro_results: List[ROTrueGP]) -> FullAnalysis:
+    """
+    Tier 3: RO totals plus tech, parts and labor aggregates in one pass.
 
-    retail_rates = []
-    cost_rates = []
+    Same results as calling the three aggregators separately, but walks
+    the ROs/jobs/line items once.
+    """
+    total_sales = 0
+    total_cost = 0
+    total_gp = 0
+    total_fee_profit = 0
+    tech = _TechAccumulator()
+    parts = _PartsAccumulator()
+    labor_acc = _LaborAccumulator()
 
     for ro in ro_results:
+        total_sales += ro.total_retail
+        total_cost += ro.total_cost
+        total_gp += ro.gross_profit
+        total_fee_profit += ro.fee_profit
         for job in ro.jobs:
+            for part in job.parts_detail:
+                parts.add(part)
             for labor in job.labor_detail:
-                total_hours += labor.hours
-                total_revenue += labor.total_retail
-                total_cost += labor.total_cost
-                total_items += 1
-
-                retail_rates.append(labor.rate)
-                cost_rates.append(labor.tech_rate)
-
-                source = labor.tech_rate_source
-                if source in by_source:
-                    by_source[source]['hours'] += labor.hours
-                    by_source[source]['revenue'] += labor.total_retail
-                    by_source[source]['cost'] += labor.total_cost
-                    by_source[source]['count'] += 1
-
-    total_profit = total_revenue - total_cost
-    overall_margin = (total_profit / total_revenue * 100) if total_revenue > 0 else 0
-
-    avg_retail = int(sum(retail_rates) / len(retail_rates)) if retail_rates else 0
-    avg_cost = int(sum(cost_rates) / len(cost_rates)) if cost_rates else 0
-
-    # Calculate margin for each source
-    for source, data in by_source.items():
-        if data['revenue'] > 0:
-            data['margin_pct'] = round((data['revenue'] - data['cost']) / data['revenue'] * 100, 2)
-        else:
-            data['margin_pct'] = 0
-
-    return LaborEfficiency(
-        total_hours_billed=round(total_hours, 2),
-        total_labor_revenue=total_revenue,
-        total_labor_cost=total_cost,
-        total_labor_profit=total_profit,
-        overall_margin_pct=round(overall_margin, 2),
-        avg_retail_rate=avg_retail,
-        avg_tech_cost_rate=avg_cost,
-        effective_spread=avg_retail - avg_cost,
-        by_rate_source=by_source,
-        total_labor_items=total_items
+                tech.add(ro.ro_id, labor)
+                labor_acc.add(labor)
+
+    return FullAnalysis(
+        total_sales=total_sales,
+        total_cost=total_cost,
+        total_gp=total_gp,
+        total_fee_profit=total_fee_profit,
+        tech_performance=tech.result(),
+        parts_margin=parts.result(),
+        labor_efficiency=labor_acc.result()
     )
 
 
@@ -1165,8 +1314,9 @@ def aggregate_advisor_performance(ro_results: List[ROTrueGP]) -> Dict[int, Advis
         advisor_id = ro.advisor_id or 0
         advisor_name = ro.advisor_name or "Unassigned"
 
-        if advisor_id not in advisor_data:
-            advisor_data[advisor_id] = {
+        data = advisor_data.get(advisor_id)
+        if data is None:
+            data = advisor_data[advisor_id] = {
                 'name': advisor_name,
                 'total_sales': 0,
                 'total_cost': 0,
@@ -1179,7 +1329,6 @@ def aggregate_advisor_performance(ro_results: List[ROTrueGP]) -> Dict[int, Advis
                 'fee_sales': 0
             }
 
-        data = advisor_data[advisor_id]
         data['total_sales'] += ro.total_retail
         data['total_cost'] += ro.total_cost
         data['gross_profit'] += ro.gross_profit
@@ -0,0 +1,42 @@
+"""
+HTTP Cache Helpers
+
+ETag / Cache-Control handling for read-only endpoints so browsers and
+proxies can revalidate instead of re-downloading unchanged payloads.
+"""
+
+import hashlib
+from typing import Any, Tuple
+
+import orjson
+from fastapi import Request, Response
+
+
+def etag_response(
+    request: Request,
+    payload: Any,
+    max_age: int = 300,
+    etag_exclude: Tuple[str, ...] = ()
+) -> Response:
+    """
+    Build a JSON response with a weak ETag derived from the payload.
+
+    etag_exclude names top-level keys (e.g. a calculated_at timestamp) left
+    out of the ETag so they don't change it on every request.
+    Returns 304 Not Modified when the client's If-None-Match matches.
+    """
+    body = orjson.dumps(payload)
+    tagged = body
+    if etag_exclude:
+        tagged = orjson.dumps({k: v for k, v in payload.items() if k not in etag_exclude})
+    etag = f'W/"{hashlib.blake2b(tagged, digest_size=8).hexdigest()}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={max_age}"
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,36 @@
+"""
+Streaming Response Helpers
+
+NDJSON (newline-delimited JSON) output for endpoints that can return
+thousands of rows, so clients start reading before the last row is encoded.
+"""
+
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator, Union
+
+import orjson
+from fastapi.responses import StreamingResponse
+
+
+def _ndjson_lines(header: Any, rows: Iterable[Any]) -> Iterator[bytes]:
+    yield orjson.dumps(header) + b"\n"
+    for row in rows:
+        yield orjson.dumps(row) + b"\n"
+
+
+async def _ndjson_lines_async(header: Any, rows: AsyncIterable[Any]) -> AsyncIterator[bytes]:
+    yield orjson.dumps(header) + b"\n"
+    async for row in rows:
+        yield orjson.dumps(row) + b"\n"
+
+
+def ndjson_response(header: Any, rows: Union[Iterable[Any], AsyncIterable[Any]]) -> StreamingResponse:
+    """
+    Stream a header object followed by one JSON line per row.
+
+    The first line is the header (everything except the rows); each
+    following line is one row. rows may be an async iterable, for rows
+    that are still being computed while earlier ones are sent.
+    """
+    if hasattr(rows, "__aiter__"):
+        return StreamingResponse(_ndjson_lines_async(header, rows), media_type="application/x-ndjson")
+    return StreamingResponse(_ndjson_lines(header, rows), media_type="application/x-ndjson")
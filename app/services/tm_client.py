@@ -5,11 +5,18 @@ Handles all HTTP requests to Tekmetric API with authentication.
 Auto-fetches JWT tokens from Supabase (refreshed by Chrome extension).
 """
 
+import asyncio
 import os
 import httpx
 from typing import Optional, Dict, Any
 from app.services.supabase_client import get_token_manager
 
+# Connection pool to TM. Sized for the audit/analytics fan-outs (tens of
+# concurrent GETs); idle connections are kept long enough to be reused
+# across bursts instead of paying a new TLS handshake each time.
+TM_MAX_CONNECTIONS = 64
+TM_KEEPALIVE_EXPIRY_SECONDS = 30.0
+
 
 class TekmetricClient:
     """Client for Tekmetric API requests"""
@@ -28,9 +35,17 @@ class TekmetricClient:
             self.auth_token = None
             self.shop_id = None
 
+        # Shared connection pool (keep-alive to TM), created lazily per event loop
+        self._http: Optional[httpx.AsyncClient] = None
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def token_valid(self) -> bool:
+        """Check for a loaded token without awaiting (fast path before _ensure_token)"""
+        return bool(self.auth_token and self.shop_id)
+
     async def _ensure_token(self):
         """Ensure we have a valid token (fetch from Supabase if needed)"""
-        if self.auth_token and self.shop_id:
+        if self.token_valid():
             return
 
         if self.use_supabase:
@@ -46,6 +61,28 @@ class TekmetricClient:
             self.auth_token = os.getenv("TM_AUTH_TOKEN")
             self.shop_id = os.getenv("TM_SHOP_ID")
 
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Pooled HTTP client, recreated if closed or bound to another event loop"""
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http.is_closed or self._http_loop is not loop:
+            self._http = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=TM_MAX_CONNECTIONS,
+                    max_keepalive_connections=TM_MAX_CONNECTIONS,
+                    keepalive_expiry=TM_KEEPALIVE_EXPIRY_SECONDS
+                )
+            )
+            self._http_loop = loop
+        return self._http
+
+    async def aclose(self):
+        """Close the pooled HTTP client (app shutdown)"""
+        if self._http is not None and not self._http.is_closed:
+            await self._http.aclose()
+        self._http = None
+        self._http_loop = None
+
     def _get_headers(self) -> Dict[str, str]:
         """Get default headers for TM API requests"""
         if not self.auth_token:
@@ -64,53 +101,58 @@ class TekmetricClient:
 
     async def get(self, path: str, params: Optional[Dict] = None) -> Any:
         """Make GET request to TM API"""
-        await self._ensure_token()
+        if not self.token_valid():
+            await self._ensure_token()
         url = f"{self.base_url}{path}"
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(url, headers=self._get_headers(), params=params)
-            response.raise_for_status()
-            return response.json()
+        client = self._get_http_client()
+        response = await client.get(url, headers=self._get_headers(), params=params)
+        response.raise_for_status()
+        return response.json()
 
     async def post(self, path: str, data: Dict) -> Any:
         """Make POST request to TM API"""
-        await self._ensure_token()
+        if not self.token_valid():
+            await self._ensure_token()
         url = f"{self.base_url}{path}"
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(url, headers=self._get_headers(), json=data)
-            response.raise_for_status()
-            return response.json()
+        client = self._get_http_client()
+        response = await client.post(url, headers=self._get_headers(), json=data)
+        response.raise_for_status()
+        return response.json()
 
     async def put(self, path: str, data: Dict) -> Any:
         """Make PUT request to TM API"""
-        await self._ensure_token()
+        if not self.token_valid():
+            await self._ensure_token()
         url = f"{self.base_url}{path}"
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.put(url, headers=self._get_headers(), json=data)
-            response.raise_for_status()
-            return response.json()
+        client = self._get_http_client()
+        response = await client.put(url, headers=self._get_headers(), json=data)
+        response.raise_for_status()
+        return response.json()
 
     async def patch(self, path: str, data: Dict) -> Any:
         """Make PATCH request to TM API"""
-        await self._ensure_token()
+        if not self.token_valid():
+            await self._ensure_token()
         url = f"{self.base_url}{path}"
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.patch(url, headers=self._get_headers(), json=data)
-            response.raise_for_status()
-            return response.json()
+        client = self._get_http_client()
+        response = await client.patch(url, headers=self._get_headers(), json=data)
+        response.raise_for_status()
+        return response.json()
 
     async def delete(self, path: str) -> Any:
         """Make DELETE request to TM API"""
-        await self._ensure_token()
+        if not self.token_valid():
+            await self._ensure_token()
         url = f"{self.base_url}{path}"
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.delete(url, headers=self._get_headers())
-            response.raise_for_status()
-            return response.json()
+        client = self._get_http_client()
+        response = await client.delete(url, headers=self._get_headers())
+        response.raise_for_status()
+        return response.json()
 
 
 # Singleton instance
@@ -123,3 +165,9 @@ def get_tm_client() -> TekmetricClient:
     if _tm_client is None:
         _tm_client = TekmetricClient()
     return _tm_client
+
+
+async def close_tm_client():
+    """Release the TM client's pooled connections (app shutdown)"""
+    if _tm_client is not None:
+        await _tm_client.aclose()
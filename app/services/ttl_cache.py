@@ -0,0 +1,52 @@
+"""
+In-Process TTL Cache
+
+Small per-process cache for computed results (aggregations, responses).
+Entries expire on a monotonic clock; the oldest entry is evicted when full.
+"""
+
+import time
+from datetime import date
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# TTLs for date-range results: ranges reaching today are still changing,
+# closed historical ranges are effectively immutable
+LIVE_RANGE_TTL_SECONDS = 60
+HISTORICAL_RANGE_TTL_SECONDS = 24 * 60 * 60
+
+
+def range_ttl(end_date: date) -> int:
+    """TTL for a result covering a date range ending on end_date"""
+    if end_date >= date.today():
+        return LIVE_RANGE_TTL_SECONDS
+    return HISTORICAL_RANGE_TTL_SECONDS
+
+
+class TTLCache:
+    """Dict-backed cache with per-entry expiry"""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return cached value, or None if missing/expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float):
+        """Store value for ttl seconds"""
+        if key not in self._data and len(self._data) >= self.maxsize:
+            # Dicts keep insertion order; drop the oldest entry
+            self._data.pop(next(iter(self._data)))
+        self._data[key] = (time.monotonic() + ttl, value)
+
+    def clear(self):
+        """Drop all entries"""
+        self._data.clear()
@@ -8,12 +8,13 @@ Provides clean REST API for TM operations with custom metric calculations.
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 import os
 import logging
 
 from app.routers import authorization, dashboard, payments, customers, ro_operations, appointments, parts, vcdb, jobs, inspections, employees, inventory, carfax, shop, reports, advanced, fleet, utility, analytics, history, realtime, advisors, trends, audit, sync, kpi_dashboard
 from app.scheduler import start_scheduler, stop_scheduler
+from app.services.tm_client import close_tm_client
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +29,7 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down TM FastAPI Backend...")
     stop_scheduler()
+    await close_tm_client()
 
 
 # Initialize FastAPI app
@@ -35,7 +37,8 @@ app = FastAPI(
     title="TM API Backend",
     description="Tekmetric API proxy with custom dashboard logic",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware (configure for your domains)